@@ -2,25 +2,49 @@
 """CLI para Cendoj PDF Discovery."""
 
 import asyncio
+import itertools
 import sys
-import json
 from pathlib import Path
-from datetime import datetime
-from typing import Optional
 
 import click
-from sqlalchemy import func
 
 # Add project root to path (kept for backward compatibility when running as script)
 sys.path.insert(0, str(Path(__file__).parent))
 
-from cendoj.config.settings import Config
-from cendoj.scraper.discovery_scanner import DiscoveryScanner
-from cendoj.storage.database import get_session, init_db
-from cendoj.storage.schemas import PDFLink, DiscoverySession
-from cendoj.utils.logger import get_logger
+# Heavy imports (SQLAlchemy, Playwright, aiohttp, ...) are deferred to the
+# command bodies so that `--help` and read-only commands start fast.
 
-logger = get_logger(__name__)
+# discover progress: one line every PROGRESS_EVERY PDFs
+PROGRESS_EVERY = 100
+
+# export: output file buffer size
+EXPORT_BUFFER_SIZE = 1 << 20
+
+# sessions: icon per session status
+SESSION_STATUS_ICONS = {
+    'completed': '✅',
+    'failed': '❌',
+    'running': '🟢',
+    'interrupted': '⏸️',
+    'cancelled': '🚫',
+}
+
+
+def _get_config(ctx):
+    """Config for this invocation, loaded once and shared with forwarded commands."""
+    config = ctx.obj.get('config')
+    if config is None:
+        from cendoj.config.settings import Config
+        config = ctx.obj['config'] = Config(ctx.obj['config_path'])
+    return config
+
+
+def _init_db(ctx):
+    """Initialize the database engine once per invocation."""
+    if not ctx.obj.get('db_initialized'):
+        from cendoj.storage.database import init_db
+        init_db(_get_config(ctx).database_path)
+        ctx.obj['db_initialized'] = True
 
 
 @click.group()
@@ -44,13 +68,14 @@ def cli(ctx, config):
 @click.pass_context
 def discover(ctx, mode: str, validate: bool, resume: bool, limit: int):
     """Descubrir todos los enlaces PDF del Cendoj."""
-    config_path = ctx.obj['config_path']
-    config = Config(config_path)
+    from cendoj.scraper.discovery_scanner import DiscoveryScanner
+    from cendoj.storage.database import get_session
+    from cendoj.storage.schemas import DiscoverySession
+
+    config = _get_config(ctx)
     
     # Override config from CLI
-    config._config['discovery'] = config._config.get('discovery', {})
-    config._config['discovery']['mode'] = mode
-    config._config['discovery']['validate_on_discovery'] = validate
+    config.override('discovery', mode=mode, validate_on_discovery=validate)
     
     click.echo(f"\n🚀 Iniciando Cendoj PDF Discovery")
     click.echo(f"   Modo: {mode.upper()}")
@@ -60,18 +85,24 @@ def discover(ctx, mode: str, validate: bool, resume: bool, limit: int):
         click.echo(f"   Límite: {limit} páginas")
     click.echo("=" * 80)
     
+    def last_interrupted_session_id():
+        _init_db(ctx)
+        with get_session() as db:
+            last = db.query(DiscoverySession.id).filter_by(
+                status='interrupted'
+            ).order_by(DiscoverySession.start_time.desc()).first()
+            return last.id if last else None
+    
     async def run():
         scanner = DiscoveryScanner(config)
         
         resume_session_id = None
         if resume:
-            # Get last interrupted session
-            db = get_session()
-            last = db.query(DiscoverySession).filter_by(
-                status='interrupted'
-            ).order_by(DiscoverySession.start_time.desc()).first()
-            if last:
-                resume_session_id = last.id
+            # Get last interrupted session (blocking DB call kept off the event loop)
+            resume_session_id = await asyncio.get_running_loop().run_in_executor(
+                None, last_interrupted_session_id
+            )
+            if resume_session_id:
                 click.echo(f"📋 Reanudando sesión: {resume_session_id}")
             else:
                 click.echo("⚠️  No hay sesiones interrumpidas para reanudar")
@@ -83,8 +114,9 @@ def discover(ctx, mode: str, validate: bool, resume: bool, limit: int):
             async for pdf in scanner.run():
                 count += 1
                 
-                # Show progress
-                if count % 10 == 0:
+                # Show progress (only every PROGRESS_EVERY PDFs, so stdout
+                # isn't written and flushed on the event loop for every one)
+                if count % PROGRESS_EVERY == 0:
                     validation = pdf.get('validation') or {}
                     status = "✅" if validation.get('accessible') else "❌"
                     click.echo(f"   {count}. {pdf['url'][:80]}... {status}")
@@ -116,60 +148,80 @@ def discover(ctx, mode: str, validate: bool, resume: bool, limit: int):
 
 
 @cli.command()
+@click.option('--exact', is_flag=True,
+              help='Recontar enlaces sobre la tabla completa en lugar de usar los contadores')
 @click.pass_context
-def stats(ctx):
+def stats(ctx, exact: bool):
     """Mostrar estadísticas de discovery."""
-    config_path = ctx.obj['config_path']
-    config = Config(config_path)
-    init_db(config.database_path)
-    
-    db = get_session()
-    
-    # PDF Link stats
-    total = db.query(PDFLink).count()
-    accessible = db.query(PDFLink).filter_by(status='accessible').count()
-    broken = db.query(PDFLink).filter_by(status='broken').count()
-    blocked = db.query(PDFLink).filter_by(status='blocked').count()
-    validated = db.query(PDFLink).filter(PDFLink.validated_at.isnot(None)).count()
+    from sqlalchemy import case, func, text
+
+    from cendoj.storage.database import LINK_COUNTERS_TABLE, get_session
+    from cendoj.storage.schemas import PDFLink, DiscoverySession
+
+    _init_db(ctx)
     
-    # Session stats
-    sessions_total = db.query(DiscoverySession).count()
-    sessions_completed = db.query(DiscoverySession).filter_by(status='completed').count()
-    sessions_failed = db.query(DiscoverySession).filter_by(status='failed').count()
-    sessions_running = db.query(DiscoverySession).filter_by(status='running').count()
+    with get_session() as db, db.begin():
+        # PDF Link stats: O(1) read of the trigger-maintained counters, or a
+        # single grouped pass (count + validated per status) with --exact
+        if exact:
+            rows = db.query(
+                PDFLink.status,
+                func.count(PDFLink.id),
+                func.sum(case((PDFLink.validated_at.isnot(None), 1), else_=0)),
+            ).group_by(PDFLink.status)
+        else:
+            rows = db.execute(text(f"SELECT status, n, validated FROM {LINK_COUNTERS_TABLE}"))
+        link_counts = {}
+        validated = 0
+        for status, count, validated_count in rows:
+            link_counts[status] = count
+            validated += validated_count or 0
+        total = sum(link_counts.values())
+        accessible = link_counts.get('accessible', 0)
+        broken = link_counts.get('broken', 0)
+        blocked = link_counts.get('blocked', 0)
     
-    click.echo("\n📊 ESTADÍSTICAS DE DISCOVERY")
-    click.echo("=" * 80)
+        # Session stats
+        session_counts = dict(
+            db.query(DiscoverySession.status, func.count(DiscoverySession.id))
+            .group_by(DiscoverySession.status)
+            .all()
+        )
+        sessions_total = sum(session_counts.values())
+        sessions_completed = session_counts.get('completed', 0)
+        sessions_failed = session_counts.get('failed', 0)
+        sessions_running = session_counts.get('running', 0)
     
-    click.echo("\n📄 Enlaces PDF:")
-    click.echo(f"   Total descubiertos: {total:,}")
-    if total > 0:
-        click.echo(f"   Accesibles: {accessible:,} ({accessible/total*100:.1f}%)")
-        click.echo(f"   Rotos: {broken:,} ({broken/total*100:.1f}%)")
-        click.echo(f"   Bloqueados: {blocked:,} ({blocked/total*100:.1f}%)")
-        click.echo(f"   Validados: {validated:,} ({validated/total*100:.1f}%)")
+        click.echo("\n📊 ESTADÍSTICAS DE DISCOVERY")
+        click.echo("=" * 80)
     
-    click.echo("\n🔄 Sesiones:")
-    click.echo(f"   Total: {sessions_total:,}")
-    click.echo(f"   Completadas: {sessions_completed:,}")
-    click.echo(f"   Fallidas: {sessions_failed:,}")
-    click.echo(f"   En ejecución: {sessions_running:,}")
+        click.echo("\n📄 Enlaces PDF:")
+        click.echo(f"   Total descubiertos: {total:,}")
+        if total > 0:
+            click.echo(f"   Accesibles: {accessible:,} ({accessible/total*100:.1f}%)")
+            click.echo(f"   Rotos: {broken:,} ({broken/total*100:.1f}%)")
+            click.echo(f"   Bloqueados: {blocked:,} ({blocked/total*100:.1f}%)")
+            click.echo(f"   Validados: {validated:,} ({validated/total*100:.1f}%)")
     
-    # Latest session
-    latest = db.query(DiscoverySession).order_by(DiscoverySession.start_time.desc()).first()
-    if latest:
-        click.echo("\n📅 Última sesión:")
-        click.echo(f"   ID: {latest.id}")
-        click.echo(f"   Modo: {latest.mode}")
-        click.echo(f"   Estado: {latest.status}")
-        click.echo(f"   Inicio: {latest.start_time}")
-        if latest.end_time:
-            duration = latest.end_time - latest.start_time
-            click.echo(f"   Duración: {duration}")
-        click.echo(f"   Páginas visitadas: {latest.total_pages_visited:,}")
-        click.echo(f"   Enlaces encontrados: {latest.total_links_found:,}")
+        click.echo("\n🔄 Sesiones:")
+        click.echo(f"   Total: {sessions_total:,}")
+        click.echo(f"   Completadas: {sessions_completed:,}")
+        click.echo(f"   Fallidas: {sessions_failed:,}")
+        click.echo(f"   En ejecución: {sessions_running:,}")
     
-    db.close()
+        # Latest session
+        latest = db.query(DiscoverySession).order_by(DiscoverySession.start_time.desc()).first()
+        if latest:
+            click.echo("\n📅 Última sesión:")
+            click.echo(f"   ID: {latest.id}")
+            click.echo(f"   Modo: {latest.mode}")
+            click.echo(f"   Estado: {latest.status}")
+            click.echo(f"   Inicio: {latest.start_time}")
+            if latest.end_time:
+                duration = latest.end_time - latest.start_time
+                click.echo(f"   Duración: {duration}")
+            click.echo(f"   Páginas visitadas: {latest.total_pages_visited:,}")
+            click.echo(f"   Enlaces encontrados: {latest.total_links_found:,}")
 
 
 @cli.command()
@@ -179,7 +231,7 @@ def proxies(ctx):
     try:
         from cendoj.utils.proxy_manager import ProxyManager
         
-        config = Config(ctx.obj['config_path'])
+        config = _get_config(ctx)
         pm = ProxyManager({'min_proxies_required': 100}, cache_file='data/proxies_cache.json')
         
         stats = pm.get_stats()
@@ -214,110 +266,146 @@ def proxies(ctx):
 @click.pass_context
 def export(ctx, output: str, status: str, limit: int):
     """Exportar enlaces descubiertos."""
-    config_path = ctx.obj['config_path']
-    config = Config(config_path)
-    init_db(config.database_path)
-    
-    db = get_session()
-    query = db.query(PDFLink).filter_by(status=status).order_by(PDFLink.discovered_at.desc())
-    
-    if limit > 0:
-        query = query.limit(limit)
-    
-    links = query.all()
+    from sqlalchemy import String, func, select
+
+    from cendoj.storage.database import get_session
+    from cendoj.storage.schemas import PDFLink
+
+    _init_db(ctx)
     
-    if not links:
-        click.echo("⚠️  No hay enlaces para exportar con ese filtro")
+    output_path = Path(output)
+    ext = output_path.suffix.lower()
+    if ext not in ('.csv', '.json', '.txt'):
+        click.echo(f"❌ Formato no soportado: {ext}")
+        click.echo("   Usa: .csv, .json, o .txt")
         return
     
-    click.echo(f"📤 Exportando {len(links)} enlaces a {output}...")
+    # Read-only export: project plain columns through Core instead of
+    # hydrating PDFLink ORM instances
+    if ext == '.txt':
+        columns = [PDFLink.url]
+    else:
+        # SQLite stores DateTime as 'YYYY-MM-DD HH:MM:SS.ffffff'; swapping the
+        # separator yields the ISO 8601 string directly and skips parsing
+        # every value into a datetime only to format it back
+        discovered_at_iso = func.replace(PDFLink.discovered_at, ' ', 'T', type_=String).label('discovered_at')
+        columns = [PDFLink.id, PDFLink.url, PDFLink.normalized_url, PDFLink.source_url,
+                   discovered_at_iso, PDFLink.status, PDFLink.http_status,
+                   PDFLink.content_length, PDFLink.extraction_method]
+        if ext == '.json':
+            columns += [PDFLink.content_type, PDFLink.final_url,
+                        PDFLink.extraction_confidence, PDFLink.metadata_json]
     
-    output_path = Path(output)
-    ext = output_path.suffix.lower()
+    stmt = select(*columns).where(PDFLink.status == status).order_by(PDFLink.discovered_at.desc())
+    if limit > 0:
+        stmt = stmt.limit(limit)
     
-    if ext == '.csv':
-        import csv
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(['id', 'url', 'normalized_url', 'source_url', 'discovered_at',
-                           'status', 'http_status', 'content_length', 'extraction_method'])
-            for link in links:
-                writer.writerow([
-                    link.id,
-                    link.url,
-                    link.normalized_url,
-                    link.source_url,
-                    link.discovered_at.isoformat() if link.discovered_at else '',
-                    link.status,
-                    link.http_status,
-                    link.content_length,
-                    link.extraction_method
-                ])
+    with get_session() as db, db.begin():
+        # Stream rows in batches instead of materialising the whole result set
+        links = iter(db.execute(stmt).yield_per(1000))
+        first = next(links, None)
     
-    elif ext == '.json':
-        data = []
-        for link in links:
-            data.append({
-                'id': link.id,
-                'url': link.url,
-                'normalized_url': link.normalized_url,
-                'source_url': link.source_url,
-                'discovered_at': link.discovered_at.isoformat() if link.discovered_at else None,
-                'status': link.status,
-                'http_status': link.http_status,
-                'content_type': link.content_type,
-                'content_length': link.content_length,
-                'final_url': link.final_url,
-                'extraction_method': link.extraction_method,
-                'extraction_confidence': link.extraction_confidence,
-                'metadata': link.metadata_json,
-            })
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        if first is None:
+            click.echo("⚠️  No hay enlaces para exportar con ese filtro")
+            return
     
-    elif ext == '.txt':
-        with open(output_path, 'w', encoding='utf-8') as f:
-            for link in links:
-                f.write(link.url + '\n')
+        links = itertools.chain((first,), links)
+        click.echo(f"📤 Exportando enlaces a {output}...")
     
-    else:
-        click.echo(f"❌ Formato no soportado: {ext}")
-        click.echo("   Usa: .csv, .json, o .txt")
-        db.close()
-        return
+        exported = 0
+        if ext == '.csv':
+            import csv
+            import io
+            # Large binary buffer underneath so encoding/writes happen in big blocks
+            with open(output_path, 'wb', buffering=EXPORT_BUFFER_SIZE) as raw, \
+                    io.TextIOWrapper(raw, encoding='utf-8', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['id', 'url', 'normalized_url', 'source_url', 'discovered_at',
+                               'status', 'http_status', 'content_length', 'extraction_method'])
+                for link in links:
+                    writer.writerow([
+                        link.id,
+                        link.url,
+                        link.normalized_url,
+                        link.source_url,
+                        link.discovered_at or '',
+                        link.status,
+                        link.http_status,
+                        link.content_length,
+                        link.extraction_method
+                    ])
+                    exported += 1
+        
+        elif ext == '.json':
+            import orjson
+            # Written as a JSON array with one object per line so that
+            # rows never have to be held in memory all at once
+            with open(output_path, 'wb') as f:
+                f.write(b'[\n')
+                for link in links:
+                    if exported:
+                        f.write(b',\n')
+                    f.write(orjson.dumps({
+                        'id': link.id,
+                        'url': link.url,
+                        'normalized_url': link.normalized_url,
+                        'source_url': link.source_url,
+                        'discovered_at': link.discovered_at,
+                        'status': link.status,
+                        'http_status': link.http_status,
+                        'content_type': link.content_type,
+                        'content_length': link.content_length,
+                        'final_url': link.final_url,
+                        'extraction_method': link.extraction_method,
+                        'extraction_confidence': link.extraction_confidence,
+                        'metadata': link.metadata_json,
+                    }))
+                    exported += 1
+                f.write(b'\n]\n')
+        
+        else:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                for link in links:
+                    f.write(link.url + '\n')
+                    exported += 1
     
-    click.echo(f"✅ Exportado completado: {len(links)} enlaces")
-    db.close()
+    click.echo(f"✅ Exportado completado: {exported} enlaces")
 
 
 @cli.command()
 @click.pass_context
 def sessions(ctx):
     """Listar sesiones de discovery."""
-    config_path = ctx.obj['config_path']
-    config = Config(config_path)
-    init_db(config.database_path)
+    from sqlalchemy import select
+
+    from cendoj.storage.database import get_session
+    from cendoj.storage.schemas import DiscoverySession
+
+    _init_db(ctx)
     
-    db = get_session()
-    sessions = db.query(DiscoverySession).order_by(DiscoverySession.start_time.desc()).limit(20).all()
+    with get_session() as db, db.begin():
+        sessions = db.execute(
+            select(DiscoverySession.id, DiscoverySession.mode, DiscoverySession.status,
+                   DiscoverySession.start_time, DiscoverySession.total_pages_visited,
+                   DiscoverySession.total_links_found)
+            .order_by(DiscoverySession.start_time.desc())
+            .limit(20)
+        ).all()
     
-    if not sessions:
-        click.echo("📭 No hay sesiones registradas")
-        return
+        if not sessions:
+            click.echo("📭 No hay sesiones registradas")
+            return
     
-    click.echo("\n📅 SESIONES RECIENTES")
-    click.echo("=" * 80)
+        click.echo("\n📅 SESIONES RECIENTES")
+        click.echo("=" * 80)
     
-    for sess in sessions:
-        start = sess.start_time.strftime('%Y-%m-%d %H:%M') if sess.start_time else 'N/A'
-        status_icon = {'completed': '✅', 'failed': '❌', 'running': '🟢',
-                      'interrupted': '⏸️', 'cancelled': '🚫'}.get(sess.status, '⚪')
+        for sess in sessions:
+            start = sess.start_time.strftime('%Y-%m-%d %H:%M') if sess.start_time else 'N/A'
+            status_icon = SESSION_STATUS_ICONS.get(sess.status, '⚪')
         
-        click.echo(f"{status_icon} {sess.id[:8]} | {sess.mode:6} | {sess.status:10} | {start}")
-        if sess.total_pages_visited or sess.total_links_found:
-            click.echo(f"    📄 Páginas: {sess.total_pages_visited:,} | 🔗 Enlaces: {sess.total_links_found:,}")
-    
-    db.close()
+            click.echo(f"{status_icon} {sess.id[:8]} | {sess.mode:6} | {sess.status:10} | {start}")
+            if sess.total_pages_visited or sess.total_links_found:
+                click.echo(f"    📄 Páginas: {sess.total_pages_visited:,} | 🔗 Enlaces: {sess.total_links_found:,}")
 
 
 @cli.command()
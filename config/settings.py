@@ -1,121 +1,245 @@
-import yaml
-from typing import Dict, List, Optional, Any
+import copy
+import os
+import re
+from functools import cached_property
+from typing import Dict, List, Optional, Any, Tuple
+
+import orjson
+
+from cendoj.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# Parsed YAML documents keyed by (path, mtime, size), shared across Config instances
+_yaml_cache: Dict[tuple, dict] = {}
+
+# Parsed YAML is also persisted next to the file (<config>.json) so new
+# processes can skip parsing; set this env var to always parse the YAML
+DISABLE_CACHE_ENV = "CENDOJ_DISABLE_CONFIG_CACHE"
+
+# Prefix for all Cendoj env var overrides
+ENV_PREFIX = "CENDOJ__"
+
+# Env override value classification (see Config._convert_value)
+_BOOL_VALUES = frozenset(('true', 'false'))
+_INT_RE = re.compile(r'-?[0-9]+\Z')
+_FLOAT_RE = re.compile(r'[-+]?(?:[0-9]+\.[0-9]*|\.[0-9]+)(?:[eE][-+]?[0-9]+)?\Z')
+
+# Config instances keyed by absolute config path (see Config.__new__)
+_INSTANCES: Dict[str, "Config"] = {}
+
+# Defaults for list-valued settings
+DEFAULT_PROXY_SOURCES = ('proxifly', 'proxyscraper')
+DEFAULT_VIEWPORTS = (
+    {'width': 1920, 'height': 1080},
+    {'width': 1366, 'height': 768},
+    {'width': 1536, 'height': 864},
+    {'width': 1440, 'height': 900},
+    {'width': 1600, 'height': 900},
+)
+
 
 class Config:
-    def __init__(self, config_path: str = "config/sites.yaml"):
+    def __new__(cls, config_path: str = "config/sites.yaml") -> "Config":
+        # One instance per config file and process; use Config.reload() to re-read it
+        key = os.path.abspath(config_path)
+        instance = _INSTANCES.get(key)
+        if instance is None:
+            instance = _INSTANCES[key] = super().__new__(cls)
+        return instance
+
+    def __init__(self, config_path: str = "config/sites.yaml") -> None:
+        if '_config' in self.__dict__:
+            return  # already loaded
         self.config_path = config_path
         self._config = self._load_config()
         self._validate_config()
+        self._resolve()
+
+    @classmethod
+    def reload(cls, config_path: str = "config/sites.yaml") -> "Config":
+        """Drop the cached instance for config_path and load it again."""
+        _INSTANCES.pop(os.path.abspath(config_path), None)
+        return cls(config_path)
 
     def _load_config(self) -> dict:
-        with open(self.config_path, 'r') as f:
-            config = yaml.safe_load(f) or {}
+        stat = os.stat(self.config_path)
+        key = (os.path.abspath(self.config_path), stat.st_mtime_ns, stat.st_size)
+        raw = _yaml_cache.get(key)
+        if raw is None:
+            raw = self._load_yaml(stat)
+            _yaml_cache[key] = raw
+        # Callers mutate their config (CLI overrides, env overrides), so each
+        # instance gets its own copy of the cached document
+        config = copy.deepcopy(raw)
         self._apply_env_overrides(config)
         return config
 
-    def _apply_env_overrides(self, config: dict):
+    def _load_yaml(self, stat: os.stat_result) -> dict:
+        """Parse the YAML file, going through the sidecar JSON cache when enabled."""
+        use_cache = not os.environ.get(DISABLE_CACHE_ENV)
+        cache_path = f"{self.config_path}.json"
+        signature = [stat.st_mtime_ns, stat.st_size]
+
+        if use_cache:
+            try:
+                with open(cache_path, 'rb') as f:
+                    cached_mtime_ns, cached_size, config = orjson.loads(f.read())
+                if [cached_mtime_ns, cached_size] == signature:
+                    return config
+            except Exception:
+                pass  # missing, stale or unreadable cache: parse the YAML
+
+        # yaml is only imported when the sidecar cache can't be used.
+        # Prefer the libyaml-backed loader when PyYAML was built with it.
+        import yaml
+        loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+        logger.debug(f"YAML loader: {loader.__name__}")
+
+        # Hand the parser one buffer instead of an incremental stream
+        with open(self.config_path, 'rb') as f:
+            config = yaml.load(f.read(), Loader=loader) or {}
+
+        if use_cache:
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            # YAML values JSON can't represent exactly (dates, sets, non-string keys,
+            # NaN) would read back differently, so such a document isn't cached
+            try:
+                data = orjson.dumps([*signature, config])
+                cacheable = orjson.loads(data)[2] == config
+            except TypeError:
+                cacheable = False
+            if not cacheable:
+                logger.debug(f"Config {self.config_path} not cacheable as JSON")
+                return config
+            try:
+                with open(tmp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, cache_path)
+            except OSError as e:
+                logger.debug(f"Could not write config cache {cache_path}: {e}")
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+        return config
+
+    def _apply_env_overrides(self, config: dict) -> None:
         """Apply environment variable overrides to config.
         
         Env vars format: CENDOJ__SECTION__KEY=value
         For nested dicts, use double underscore: CENDOJ__browser__stealth=true
         For list sections like sites, use array index: CENDOJ__sites__0__name=site1
         """
-        import os
-        from typing import Any
-        
-        def _set_nested_value(d: dict, keys: list, value: str):
-            """Set a nested value in dict using list of keys."""
-            for key in keys[:-1]:
-                if key not in d:
-                    d[key] = {}
-                d = d[key]
-            final_key = keys[-1]
-            d[final_key] = self._convert_value(value)
-
-        # Prefix for all Cendoj env vars
-        prefix = "CENDOJ__"
-        
-        for env_key, env_value in os.environ.items():
-            if not env_key.startswith(prefix):
-                continue
-            
+        prefix = ENV_PREFIX
+        prefix_len = len(prefix)
+        overrides = [(key[prefix_len:], value) for key, value in os.environ.items()
+                     if key.startswith(prefix)]
+        if not overrides:
+            return
+
+        convert = self._convert_value
+        for env_key, env_value in overrides:
             # Remove prefix and split by __
-            parts = env_key[len(prefix):].lower().split('__')
+            parts = env_key.lower().split('__')
             if len(parts) < 2:
                 continue  # Need at least section and key
-            
-            _set_nested_value(config, parts, env_value)
+
+            d = config
+            for key in parts[:-1]:
+                d = d.setdefault(key, {})
+            d[parts[-1]] = convert(env_value)
 
     def _convert_value(self, value: str) -> Any:
         """Convert string value to appropriate type."""
         # Boolean
-        if value.lower() in ('true', 'false'):
-            return value.lower() == 'true'
+        lowered = value.lower()
+        if lowered in _BOOL_VALUES:
+            return lowered == 'true'
         
         # Integer
-        try:
-            if value.isdigit() or (value.startswith('-') and value[1:].isdigit()):
-                return int(value)
-        except (ValueError, AttributeError):
-            pass
+        if _INT_RE.match(value):
+            return int(value)
         
         # Float
-        try:
-            if '.' in value:
-                return float(value)
-        except (ValueError, AttributeError):
-            pass
+        if _FLOAT_RE.match(value):
+            return float(value)
         
-        # List (comma-separated)
+        # List (comma-separated), items converted individually
         if ',' in value:
-            items = [item.strip() for item in value.split(',')]
-            # Try to convert items to appropriate types
-            converted = []
-            for item in items:
-                converted.append(self._convert_value(item))
-            return converted
+            convert = self._convert_value
+            return [convert(item.strip()) for item in value.split(',')]
         
         # Default: string
         return value
 
-    def _validate_config(self):
+    def _validate_config(self) -> None:
         """Validate required configuration sections exist."""
         required_sections = ['sites', 'browser', 'download', 'storage', 'logging']
         for section in required_sections:
             if section not in self._config:
                 raise ValueError(f"Missing required configuration section: {section}")
 
-    @property
+    def _resolve(self) -> None:
+        """Resolve every setting once; later reads hit the instance dict directly."""
+        for name in _SETTINGS:
+            self.__dict__.pop(name, None)
+        for name in _SETTINGS:
+            getattr(self, name)
+
+    def override(self, section: str, **values: Any) -> None:
+        """Override keys of a config section and re-resolve settings."""
+        self._config.setdefault(section, {}).update(values)
+        self._resolve()
+
+    @cached_property
     def sites(self) -> List[Dict]:
         """Return list of site configurations."""
         return self._config.get('sites', [])
 
-    @property
+    @cached_property
+    def site_seed_urls(self) -> Tuple[str, ...]:
+        """Return the deduplicated base_url/path seeds of all enabled sites."""
+        urls = {}
+        for site in self.sites:
+            if not site.get('enabled', True):
+                continue
+            base_url = (site.get('base_url') or '').rstrip('/')
+            if not base_url:
+                continue
+            for path in site.get('paths', []):
+                if path:
+                    urls[f"{base_url}/{path.lstrip('/')}"] = None
+        return tuple(urls)
+
+    @cached_property
     def browser_config(self) -> Dict:
         """Return browser configuration."""
         return self._config.get('browser', {})
 
-    @property
+    @cached_property
     def download_config(self) -> Dict:
         """Return download configuration."""
         return self._config.get('download', {})
 
-    @property
+    @cached_property
     def storage_config(self) -> Dict:
         """Return storage configuration."""
         return self._config.get('storage', {})
 
-    @property
+    @cached_property
     def logging_config(self) -> Dict:
         """Return logging configuration."""
         return self._config.get('logging', {})
 
-    @property
+    @cached_property
     def request_config(self) -> Dict:
         """Return request configuration (optional)."""
         return self._config.get('request', {})
 
-    @property
+    @cached_property
     def proxy_config(self) -> Dict:
         """Return proxy configuration (optional)."""
         return self._config.get('proxy', {
@@ -124,103 +248,103 @@ class Config:
             'rotation_interval': 900
         })
 
-    @property
+    @cached_property
     def stealth_mode(self) -> bool:
         """Return browser stealth mode setting."""
         return self.browser_config.get('stealth', False)
 
-    @property
+    @cached_property
     def headless(self) -> bool:
         """Return headless mode setting."""
         return self.browser_config.get('headless', True)
 
-    @property
+    @cached_property
     def user_agent(self) -> str:
         """Return user agent string."""
         return self.browser_config.get('user_agent', '')
 
-    @property
+    @cached_property
     def max_concurrent(self) -> int:
         """Return max concurrent downloads."""
         return self.download_config.get('max_concurrent', 5)
 
-    @property
+    @cached_property
     def chunk_size(self) -> int:
         """Return download chunk size."""
         return self.download_config.get('chunk_size', 65536)
 
-    @property
+    @cached_property
     def download_timeout(self) -> int:
         """Return download timeout in seconds."""
         return self.download_config.get('timeout', 300)
 
-    @property
+    @cached_property
     def database_path(self) -> str:
         """Return database path."""
         return self.storage_config.get('database', 'data/documents.db')
 
-    @property
+    @cached_property
     def backup_dir(self) -> str:
         """Return backup directory."""
         return self.storage_config.get('backup_dir', 'data/backups')
 
-    @property
+    @cached_property
     def export_dir(self) -> str:
         """Return export directory."""
         return self.storage_config.get('export_dir', 'data/exports')
 
-    @property
+    @cached_property
     def log_level(self) -> str:
         """Return log level."""
         return self.logging_config.get('level', 'INFO')
 
-    @property
+    @cached_property
     def log_file(self) -> str:
         """Return log file path."""
         return self.logging_config.get('file', 'logs/scraper.log')
 
-    @property
+    @cached_property
     def log_max_size_mb(self) -> int:
         """Return max log file size in MB."""
         return self.logging_config.get('max_size_mb', 10)
 
-    @property
+    @cached_property
     def log_backup_count(self) -> int:
         """Return number of log backups to keep."""
         return self.logging_config.get('backup_count', 3)
 
-    @property
+    @cached_property
     def rate_limit(self) -> float:
         """Return rate limit in seconds."""
         return self._config.get('rate_limit', 1.0)
 
-    @property
+    @cached_property
     def request_retries(self) -> int:
         """Return number of retries for requests."""
         return self.request_config.get('retries', 3)
 
-    @property
+    @cached_property
     def backoff_factor(self) -> float:
         """Return backoff factor for retries."""
         return self.request_config.get('backoff_factor', 1.0)
 
-    @property
+    @cached_property
     def request_timeout(self) -> int:
         """Return request timeout in seconds."""
         return self.request_config.get('timeout', 30)
 
-    @property
+    @cached_property
     def scrape_only(self) -> bool:
         """Return whether to only scrape URLs without downloading."""
         return self.download_config.get('scrape_only', False)
 
-    @property
+    @cached_property
     def validate_url_timeout(self) -> int:
         """Return timeout for URL validation requests in seconds."""
         return self.download_config.get('validate_url_timeout', 10)
 
     # ========== DISCOVERY CONFIG ==========
-    @property
+    @cached_property
     def discovery_config(self) -> Dict:
         """Return discovery configuration."""
         return self._config.get('discovery', {
@@ -229,6 +353,9 @@ class Config:
             'follow_internal_links': True,
             'follow_external_links': False,
             'extract_from_scripts': True,
+            'regex_fallback': False,
+            'concurrency': 1,
+            'visited_filter': 'set',
             'max_pages_per_collection': 0,
             'respect_robots_txt': False,
             'validate_on_discovery': True,
@@ -236,32 +363,52 @@ class Config:
             'dedup_normalize_urls': True,
         })
 
-    @property
+    @cached_property
     def discovery_mode(self) -> str:
         """Return discovery mode."""
         return self.discovery_config.get('mode', 'full')
 
-    @property
+    @cached_property
     def discovery_max_depth(self) -> int:
         """Return max depth for deep crawl (0 = unlimited)."""
         return self.discovery_config.get('max_depth', 0)
 
-    @property
+    @cached_property
     def discovery_validate_on_discovery(self) -> bool:
         """Whether to validate URLs (HEAD request) after discovery."""
         return self.discovery_config.get('validate_on_discovery', True)
 
-    @property
+    @cached_property
     def discovery_deduplicate(self) -> bool:
         """Whether to deduplicate discovered URLs."""
         return self.discovery_config.get('deduplicate', True)
 
-    @property
+    @cached_property
     def discovery_follow_internal_links(self) -> bool:
         """Whether to enqueue internal links during discovery."""
         return self.discovery_config.get('follow_internal_links', True)
 
-    @property
+    @cached_property
+    def discovery_concurrency(self) -> int:
+        """Number of pages the deep crawler visits in parallel."""
+        return self.discovery_config.get('concurrency', 1)
+
+    @cached_property
+    def discovery_visited_filter(self) -> str:
+        """Visited-URL store for the deep crawler: set (exact) or bloom (compact, rare false positives)."""
+        return self.discovery_config.get('visited_filter', 'set')
+
+    @cached_property
+    def discovery_extract_from_scripts(self) -> bool:
+        """Whether to regex-scan <script> bodies for PDF URLs."""
+        return self.discovery_config.get('extract_from_scripts', True)
+
+    @cached_property
+    def discovery_regex_fallback(self) -> bool:
+        """Whether to regex-scan the full page HTML for PDF URLs (slow on large pages)."""
+        return self.discovery_config.get('regex_fallback', False)
+
+    @cached_property
     def sitemap_config(self) -> Dict:
         """Return sitemap discovery configuration."""
         return self._config.get('sitemap', {
@@ -274,7 +421,7 @@ class Config:
             'exclude_patterns': [],
         })
 
-    @property
+    @cached_property
     def pattern_generator_config(self) -> Dict:
         """Return pattern generator discovery configuration."""
         return self._config.get('pattern_generator', {
@@ -285,7 +432,7 @@ class Config:
             'exclude_patterns': [],
         })
 
-    @property
+    @cached_property
     def search_explorer_config(self) -> Dict:
         """Return search explorer discovery configuration."""
         return self._config.get('search_explorer', {
@@ -297,7 +444,7 @@ class Config:
             'exclude_patterns': [],
         })
 
-    @property
+    @cached_property
     def taxonomy_config(self) -> Dict:
         """Return taxonomy discovery configuration."""
         return self._config.get('taxonomy', {
@@ -311,7 +458,7 @@ class Config:
             'exclude_patterns': [],
         })
 
-    @property
+    @cached_property
     def form_discovery_config(self) -> Dict:
         """Return form discovery configuration."""
         return self._config.get('form_discovery', {
@@ -325,212 +472,235 @@ class Config:
         })
 
     # ========== ANTI-BLOCKING CONFIG ==========
-    @property
+    @cached_property
     def anti_blocking_config(self) -> Dict:
         """Return anti-blocking configuration."""
         return self._config.get('anti_blocking', {})
 
-    @property
+    # anti_blocking sub-sections, resolved once instead of per setting
+    @cached_property
+    def _proxy_cfg(self) -> Dict:
+        return self.anti_blocking_config.get('proxy') or {}
+
+    @cached_property
+    def _ua_cfg(self) -> Dict:
+        return self.anti_blocking_config.get('user_agent') or {}
+
+    @cached_property
+    def _behavior_cfg(self) -> Dict:
+        return self.anti_blocking_config.get('behavior') or {}
+
+    @cached_property
+    def _random_delays_cfg(self) -> Dict:
+        return self._behavior_cfg.get('random_delays') or {}
+
+    @cached_property
+    def _rate_limiting_cfg(self) -> Dict:
+        return self.anti_blocking_config.get('rate_limiting') or {}
+
+    @cached_property
+    def _fingerprint_cfg(self) -> Dict:
+        return self.anti_blocking_config.get('fingerprint') or {}
+
+    @cached_property
+    def _captcha_cfg(self) -> Dict:
+        return self.anti_blocking_config.get('captcha') or {}
+
+    @cached_property
     def proxy_enabled(self) -> bool:
         """Whether proxy rotation is enabled."""
-        return self.anti_blocking_config.get('proxy', {}).get('enabled', True)
+        return self._proxy_cfg.get('enabled', True)
 
-    @property
+    @cached_property
     def proxy_sources(self) -> List[str]:
         """List of proxy source names to use."""
-        return self.anti_blocking_config.get('proxy', {}).get('sources', ['proxifly', 'proxyscraper'])
+        return self._proxy_cfg.get('sources', list(DEFAULT_PROXY_SOURCES))
 
-    @property
+    @cached_property
     def proxy_refresh_hours(self) -> int:
         """How often to refresh proxy pool in hours."""
-        return self.anti_blocking_config.get('proxy', {}).get('refresh_hours', 6)
+        return self._proxy_cfg.get('refresh_hours', 6)
 
-    @property
+    @cached_property
     def proxy_min_anonymity(self) -> str:
         """Minimum anonymity level required."""
-        return self.anti_blocking_config.get('proxy', {}).get('min_anonymity', 'elite')
+        return self._proxy_cfg.get('min_anonymity', 'elite')
 
-    @property
+    @cached_property
     def proxy_require_https(self) -> bool:
         """Whether to require HTTPS support."""
-        return self.anti_blocking_config.get('proxy', {}).get('require_https', False)
+        return self._proxy_cfg.get('require_https', False)
 
-    @property
+    @cached_property
     def proxy_test_before_use(self) -> bool:
         """Whether to test proxies before using them."""
-        return self.anti_blocking_config.get('proxy', {}).get('test_before_use', True)
+        return self._proxy_cfg.get('test_before_use', True)
 
-    @property
+    @cached_property
     def proxy_rotate_per_request(self) -> bool:
         """Whether to rotate proxy for each request."""
-        return self.anti_blocking_config.get('proxy', {}).get('rotate_per_request', True)
+        return self._proxy_cfg.get('rotate_per_request', True)
 
-    @property
+    @cached_property
     def proxy_rotate_on_error(self) -> bool:
         """Whether to rotate proxy on error (429, 403, etc)."""
-        return self.anti_blocking_config.get('proxy', {}).get('rotate_on_error', True)
+        return self._proxy_cfg.get('rotate_on_error', True)
 
-    @property
+    @cached_property
     def ua_pool_file(self) -> str:
         """Path to user agents file."""
-        return self.anti_blocking_config.get('user_agent', {}).get('pool_file', 'config/user_agents.txt')
+        return self._ua_cfg.get('pool_file', 'config/user_agents.txt')
 
-    @property
+    @cached_property
     def ua_rotate_per_session(self) -> bool:
         """Whether to rotate user agent per session."""
-        return self.anti_blocking_config.get('user_agent', {}).get('rotate_per_session', True)
+        return self._ua_cfg.get('rotate_per_session', True)
 
-    @property
+    @cached_property
     def ua_rotate_per_request(self) -> bool:
         """Whether to rotate user agent per request."""
-        return self.anti_blocking_config.get('user_agent', {}).get('rotate_per_request', False)
+        return self._ua_cfg.get('rotate_per_request', False)
 
-    @property
+    @cached_property
     def behavior_simulate_human(self) -> bool:
         """Whether to simulate human behavior."""
-        return self.anti_blocking_config.get('behavior', {}).get('simulate_human', True)
+        return self._behavior_cfg.get('simulate_human', True)
 
-    @property
+    @cached_property
     def behavior_random_delays_enabled(self) -> bool:
         """Whether to use random delays."""
-        return self.anti_blocking_config.get('behavior', {}).get('random_delays', {}).get('enabled', True)
+        return self._random_delays_cfg.get('enabled', True)
 
-    @property
+    @cached_property
     def behavior_min_delay(self) -> float:
         """Minimum delay in seconds."""
-        return self.anti_blocking_config.get('behavior', {}).get('random_delays', {}).get('min', 1.0)
+        return self._random_delays_cfg.get('min', 1.0)
 
-    @property
+    @cached_property
     def behavior_max_delay(self) -> float:
         """Maximum delay in seconds."""
-        return self.anti_blocking_config.get('behavior', {}).get('random_delays', {}).get('max', 5.0)
+        return self._random_delays_cfg.get('max', 5.0)
 
-    @property
+    @cached_property
     def behavior_delay_distribution(self) -> str:
         """Delay distribution: uniform, normal, exponential."""
-        return self.anti_blocking_config.get('behavior', {}).get('random_delays', {}).get('distribution', 'normal')
+        return self._random_delays_cfg.get('distribution', 'normal')
 
-    @property
+    @cached_property
     def behavior_mouse_movements(self) -> bool:
         """Whether to simulate mouse movements."""
-        return self.anti_blocking_config.get('behavior', {}).get('mouse_movements', False)
+        return self._behavior_cfg.get('mouse_movements', False)
 
-    @property
+    @cached_property
     def behavior_scrolling(self) -> bool:
         """Whether to simulate scrolling."""
-        return self.anti_blocking_config.get('behavior', {}).get('scrolling', False)
+        return self._behavior_cfg.get('scrolling', False)
 
-    @property
+    @cached_property
     def rate_limiting_strategy(self) -> str:
         """Rate limiting strategy: fixed, adaptive, stealth."""
-        return self.anti_blocking_config.get('rate_limiting', {}).get('strategy', 'adaptive')
+        return self._rate_limiting_cfg.get('strategy', 'adaptive')
 
-    @property
+    @cached_property
     def rate_limiting_requests_per_minute(self) -> int:
         """Base requests per minute."""
-        return self.anti_blocking_config.get('rate_limiting', {}).get('requests_per_minute', 20)
+        return self._rate_limiting_cfg.get('requests_per_minute', 20)
 
-    @property
+    @cached_property
     def rate_limiting_burst_size(self) -> int:
         """Burst size for rate limiting."""
-        return self.anti_blocking_config.get('rate_limiting', {}).get('burst_size', 5)
+        return self._rate_limiting_cfg.get('burst_size', 5)
 
-    @property
+    @cached_property
     def rate_limiting_backoff_on_429(self) -> bool:
         """Whether to back off on 429 responses."""
-        return self.anti_blocking_config.get('rate_limiting', {}).get('backoff_on_429', True)
+        return self._rate_limiting_cfg.get('backoff_on_429', True)
 
-    @property
+    @cached_property
     def rate_limiting_max_backoff_seconds(self) -> int:
         """Maximum backoff time in seconds."""
-        return self.anti_blocking_config.get('rate_limiting', {}).get('max_backoff_seconds', 300)
+        return self._rate_limiting_cfg.get('max_backoff_seconds', 300)
 
-    @property
+    @cached_property
     def rate_limiting_decrease_on_4xx(self) -> bool:
         """Whether to decrease rate on 4xx errors."""
-        return self.anti_blocking_config.get('rate_limiting', {}).get('decrease_on_4xx', True)
+        return self._rate_limiting_cfg.get('decrease_on_4xx', True)
 
-    @property
+    @cached_property
     def fingerprint_randomized(self) -> bool:
         """Whether to randomize browser fingerprint."""
-        return self.anti_blocking_config.get('fingerprint', {}).get('randomized', True)
+        return self._fingerprint_cfg.get('randomized', True)
 
-    @property
+    @cached_property
     def fingerprint_rotate_after(self) -> int:
         """Rotate fingerprint after N requests."""
-        return self.anti_blocking_config.get('fingerprint', {}).get('rotate_after', 50)
+        return self._fingerprint_cfg.get('rotate_after', 50)
 
-    @property
+    @cached_property
     def fingerprint_webgl_spoof(self) -> bool:
         """Whether to spoof WebGL."""
-        return self.anti_blocking_config.get('fingerprint', {}).get('webgl_spoof', True)
+        return self._fingerprint_cfg.get('webgl_spoof', True)
 
-    @property
+    @cached_property
     def fingerprint_canvas_spoof(self) -> bool:
         """Whether to spoof Canvas."""
-        return self.anti_blocking_config.get('fingerprint', {}).get('canvas_spoof', True)
+        return self._fingerprint_cfg.get('canvas_spoof', True)
 
-    @property
+    @cached_property
     def fingerprint_webrtc_leak_protection(self) -> bool:
         """Whether to enable WebRTC leak protection."""
-        return self.anti_blocking_config.get('fingerprint', {}).get('webrtc_leak_protection', True)
+        return self._fingerprint_cfg.get('webrtc_leak_protection', True)
 
-    @property
+    @cached_property
     def captcha_auto_detect(self) -> bool:
         """Whether to automatically detect CAPTCHAs."""
-        return self.anti_blocking_config.get('captcha', {}).get('auto_detect', True)
+        return self._captcha_cfg.get('auto_detect', True)
 
-    @property
+    @cached_property
     def captcha_pause_on_captcha(self) -> bool:
         """Whether to pause when CAPTCHA detected."""
-        return self.anti_blocking_config.get('captcha', {}).get('pause_on_captcha', True)
+        return self._captcha_cfg.get('pause_on_captcha', True)
 
-    @property
+    @cached_property
     def captcha_screenshot_on_captcha(self) -> bool:
         """Whether to take screenshot on CAPTCHA."""
-        return self.anti_blocking_config.get('captcha', {}).get('screenshot_on_captcha', True)
+        return self._captcha_cfg.get('screenshot_on_captcha', True)
 
-    @property
+    @cached_property
     def captcha_manual_solve_timeout(self) -> int:
         """Timeout for manual CAPTCHA solving in seconds."""
-        return self.anti_blocking_config.get('captcha', {}).get('manual_solve_timeout', 300)
+        return self._captcha_cfg.get('manual_solve_timeout', 300)
 
     # ========== BROWSER CONFIG EXPANDED ==========
-    @property
+    @cached_property
     def random_viewport(self) -> bool:
         """Whether to use random viewport."""
         return self.browser_config.get('random_viewport', True)
 
-    @property
+    @cached_property
     def viewport_variations(self) -> List[Dict]:
         """List of viewport variations to use."""
-        return self.browser_config.get('viewport_variations', [
-            {'width': 1920, 'height': 1080},
-            {'width': 1366, 'height': 768},
-            {'width': 1536, 'height': 864},
-            {'width': 1440, 'height': 900},
-            {'width': 1600, 'height': 900},
-        ])
+        return self.browser_config.get('viewport_variations', [dict(v) for v in DEFAULT_VIEWPORTS])
 
     # ========== STORAGE CONFIG EXPANDED ==========
-    @property
+    @cached_property
     def session_dir(self) -> str:
         """Directory for session files."""
         return self.storage_config.get('session_dir', 'data/sessions')
 
     # ========== LOGGING CONFIG EXPANDED ==========
-    @property
+    @cached_property
     def discovery_verbosity(self) -> str:
         """Discovery logging verbosity: QUIET, NORMAL, VERBOSE, DEBUG."""
         return self.logging_config.get('discovery_verbosity', 'NORMAL')
 
-    @property
+    @cached_property
     def separate_discovery_log(self) -> bool:
         """Whether to use separate log file for discovery."""
         return self.logging_config.get('separate_discovery_log', True)
 
     # ========== NETWORK INTERCEPTION CONFIG ==========
-    @property
+    @cached_property
     def network_interception_config(self) -> Dict:
         """Return network interception configuration."""
         return self._config.get('network_interception', {
@@ -541,7 +711,7 @@ class Config:
         })
 
     # ========== STRUCTURED DATA CONFIG ==========
-    @property
+    @cached_property
     def structured_data_config(self) -> Dict:
         """Return structured data extraction configuration."""
         return self._config.get('structured_data', {
@@ -551,7 +721,7 @@ class Config:
         })
 
     # ========== ARCHIVE DISCOVERY CONFIG ==========
-    @property
+    @cached_property
     def archive_discovery_config(self) -> Dict:
         """Return archive/legacy discovery configuration."""
         return self._config.get('archive_discovery', {
@@ -562,10 +732,14 @@ class Config:
         })
 
     # ========== COVERAGE ANALYSIS CONFIG ==========
-    @property
+    @cached_property
     def coverage_analysis_config(self) -> Dict:
         """Return coverage analysis configuration."""
         return self._config.get('coverage_analysis', {
             'enabled': False,
             'report_interval': 1000,
         })
+
+
+# Names of all cached settings, in definition order (see Config._resolve)
+_SETTINGS = tuple(name for name, attr in vars(Config).items() if isinstance(attr, cached_property))
@@ -3,10 +3,14 @@
 from __future__ import annotations
 
 import re
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, field
+from collections import Counter
+from contextlib import contextmanager
+from typing import List, Dict, Any, NamedTuple, Optional, Set
+from functools import lru_cache
 from urllib.parse import urljoin
 
+from sqlalchemy import insert
+
 from cendoj.utils.logger import get_logger
 from cendoj.storage.database import get_session
 from cendoj.storage.schemas import BreadcrumbTrail
@@ -14,14 +18,43 @@ from cendoj.storage.schemas import BreadcrumbTrail
 
 logger = get_logger(__name__)
 
+# Elements that can hold a breadcrumb trail, identified by class name
+_CONTAINER_TAGS = ['nav', 'ol', 'ul', 'div']
+_CONTAINER_CLASS_RE = re.compile(r'(breadcrumb|crumb|nav-path|crumbs)')
+
+try:
+    from selectolax.parser import HTMLParser as _FastHTMLParser
+except ImportError:  # optional dependency; fall back to BeautifulSoup
+    _FastHTMLParser = None
 
-@dataclass
-class Breadcrumb:
-    """A single breadcrumb element."""
+
+class Breadcrumb(NamedTuple):
+    """A single breadcrumb element (immutable and hashable, no per-instance __dict__)."""
     text: str
     url: Optional[str] = None
 
 
+@lru_cache(maxsize=None)
+def _compiled_selector():
+    """The fused breadcrumb selector compiled once with soupsieve (BS4 path).
+
+    Calling the compiled pattern directly skips the per-call selector
+    parsing that Tag.select() does.
+    """
+    import soupsieve
+    return soupsieve.compile(BreadcrumbExtractor._COMBINED_SELECTOR)
+
+
+def _fast_container(node):
+    """Nearest breadcrumb container ancestor of a selectolax node, or None."""
+    parent = node.parent
+    while parent is not None:
+        if parent.tag in _CONTAINER_TAGS and _CONTAINER_CLASS_RE.search(parent.attributes.get('class') or ''):
+            return parent
+        parent = parent.parent
+    return None
+
+
 class BreadcrumbExtractor:
     """Extract breadcrumb trails from HTML content."""
 
@@ -37,50 +70,72 @@ class BreadcrumbExtractor:
         'ul.breadcrumb li a'
     ]
 
+    # All selectors fused into one query, so the document is walked once
+    _COMBINED_SELECTOR = ', '.join(SELECTORS)
+
     @classmethod
     def extract(cls, html_content: str, base_url: str = '') -> List[List[Breadcrumb]]:
         """
         Extract all breadcrumb trails from HTML.
         Returns a list of trails, each trail is a list of Breadcrumb objects.
         """
+        if _FastHTMLParser is not None:
+            return cls._extract_fast(html_content, base_url)
+
         from bs4 import BeautifulSoup
         soup = BeautifulSoup(html_content, 'html.parser')
         trails = []
 
-        for selector in cls.SELECTORS:
-            elements = soup.select(selector)
-            if not elements:
-                continue
+        # Build one trail per breadcrumb container from the matched elements
+        for group in cls._group_by_parent(_compiled_selector().select(soup)):
+            trail = []
+            for el in group:
+                text = el.get_text(strip=True)
+                href = el.get('href')
+                url = urljoin(base_url, href) if href else None
+                trail.append(Breadcrumb(text=text, url=url))
+            if len(trail) >= 2:  # at least two elements
+                trails.append(trail)
+
+        return trails
+
+    @classmethod
+    def _extract_fast(cls, html_content: str, base_url: str = '') -> List[List[Breadcrumb]]:
+        """selectolax variant of extract(); same trails, without building a BS4 tree."""
+        tree = _FastHTMLParser(html_content)
+        nodes = tree.css(cls._COMBINED_SELECTOR)
+        matched = {node.mem_id for node in nodes}
+
+        containers = {}
+        for node in nodes:
+            parent = _fast_container(node)
+            if parent is not None:
+                containers.setdefault(parent.mem_id, parent)
 
-            # Build trail from consecutive elements in the same breadcrumb container
-            # Group by common parent
-            for parent in cls._group_by_parent(elements):
-                trail = []
-                for el in parent:
-                    text = el.get_text(strip=True)
-                    href = el.get('href')
-                    url = urljoin(base_url, href) if href else None
-                    trail.append(Breadcrumb(text=text, url=url))
-                if trail and len(trail) >= 2:  # at least two elements
-                    trails.append(trail)
+        trails = []
+        for container_id, container in containers.items():
+            # Walk the container subtree so trail items keep document order
+            trail = []
+            for node in container.traverse():
+                if node.mem_id not in matched or _fast_container(node).mem_id != container_id:
+                    continue
+                href = node.attributes.get('href')
+                url = urljoin(base_url, href) if href else None
+                trail.append(Breadcrumb(text=node.text(strip=True), url=url))
+            if len(trail) >= 2:  # at least two elements
+                trails.append(trail)
 
         return trails
 
     @staticmethod
     def _group_by_parent(elements):
-        """Group elements by their immediate breadcrumb container parent."""
-        from bs4 import BeautifulSoup
-        groups = []
-        seen_parents = set()
-
+        """Group elements (in document order) by their breadcrumb container parent."""
+        groups = {}
         for el in elements:
-            parent = el.find_parent(['nav', 'ol', 'ul', 'div'], class_=re.compile(r'(breadcrumb|crumb|nav-path|crumbs)'))
-            if parent and id(parent) not in seen_parents:
-                seen_parents.add(id(parent))
-                # Collect all breadcrumb links within this parent in order
-                children = parent.select(', '.join(BreadcrumbExtractor.SELECTORS))
-                groups.append(children)
-        return groups
+            parent = el.find_parent(_CONTAINER_TAGS, class_=_CONTAINER_CLASS_RE)
+            if parent is not None:
+                groups.setdefault(id(parent), []).append(el)
+        return list(groups.values())
 
 
 class BreadcrumbAnalyzer:
@@ -89,73 +144,100 @@ class BreadcrumbAnalyzer:
     def __init__(self):
         self.logger = get_logger(f"{self.__class__.__name__}")
 
-    def analyze_trails(self, trails: List[List[Breadcrumb]]) -> Dict[str, Any]:
+    def analyze_trails(
+        self,
+        trails: List[List[Breadcrumb]],
+        include_texts: bool = False,
+        visited_urls: Optional[Set[str]] = None
+    ) -> Dict[str, Any]:
         """
         Analyze trails to produce taxonomy insights.
         Returns a dict with:
-        - unique_paths: set of normalized path strings
+        - unique_paths: list of normalized path strings
         - depth_distribution: dict[depth, count]
-        - orphan_pages: list of URLs that appear as leaves without parent entries
-        - missing_intermediates: set of URLs that are referenced but never visited as pages
+        - orphan_pages: intermediate URLs (never a trail leaf) not in visited_urls
+        - path_texts: 'A > B > C' strings, only when include_texts=True
         """
-        stats = {
-            'total_trails': len(trails),
-            'unique_paths': set(),
-            'depth_distribution': {},
-            'orphan_pages': [],
-            'path_texts': []
-        }
-
+        unique_paths = set()
+        depth_counter = Counter()
+        path_texts = []
         all_urls = set()
         leaf_urls = set()
 
         for trail in trails:
-            path_parts = []
-            for i, crumb in enumerate(trail):
-                if crumb.url:
-                    path_parts.append(crumb.url)
-                    all_urls.add(crumb.url)
-                    if i == len(trail) - 1:
-                        leaf_urls.add(crumb.url)
-            if path_parts:
-                normalized_path = '|'.join(path_parts)
-                stats['unique_paths'].add(normalized_path)
-                stats['path_texts'].append(' > '.join(c.text for c in trail))
-                depth = len(trail)
-                stats['depth_distribution'][depth] = stats['depth_distribution'].get(depth, 0) + 1
-
-        # Orphan pages: leaf URLs whose parent URLs never appeared as a page (breadcrumb URL that is not a leaf elsewhere)
-        # Basic heuristic: if a URL appears only as a non-last element, it's an intermediate node; if never appears as leaf, it's orphan
+            path_parts = [crumb.url for crumb in trail if crumb.url]
+            if not path_parts:
+                continue
+            all_urls.update(path_parts)
+            if trail[-1].url:
+                leaf_urls.add(trail[-1].url)
+            unique_paths.add('|'.join(path_parts))
+            depth_counter[len(trail)] += 1
+            if include_texts:
+                path_texts.append(' > '.join(c.text for c in trail))
+
+        # URLs that only ever appear as a non-last element are intermediate nodes;
+        # those never crawled as content pages are orphans
         intermediate_urls = all_urls - leaf_urls
-        # Pages that are referenced in breadcrumbs but haven't been crawled as content pages
-        stats['orphan_pages'] = list(all_urls)  # simplified; can refine with visited pages check
+        if visited_urls is not None:
+            intermediate_urls -= visited_urls
 
-        stats['unique_paths'] = list(stats['unique_paths'])
+        stats = {
+            'total_trails': len(trails),
+            'unique_paths': list(unique_paths),
+            'depth_distribution': dict(depth_counter),
+            'orphan_pages': list(intermediate_urls)
+        }
+        if include_texts:
+            stats['path_texts'] = path_texts
         return stats
 
 
 class BreadcrumbDBRecorder:
     """Persist breadcrumb trails to database."""
 
-    def __init__(self, db_session):
+    def __init__(self, db_session, batch_size: int = 100):
         self.db_session = db_session
         self.logger = get_logger(f"{self.__class__.__name__}")
+        self._pending: List[Dict[str, Any]] = []
+        self._batch_size = batch_size
+        self._batching = False
+
+    @staticmethod
+    def _row(page_url: str, trail: List[Breadcrumb]) -> Dict[str, Any]:
+        # The breadcrumbs column encodes Breadcrumb tuples as {"text", "url"} objects
+        return {'page_url': page_url, 'breadcrumbs': trail}
 
     def record_trail(self, page_url: str, trail: List[Breadcrumb]):
-        """Store a breadcrumb trail for a given page."""
-        # Convert to JSON-serializable format
-        breadcrumb_data = [
-            {'text': b.text, 'url': b.url}
-            for b in trail
-        ]
-        record = BreadcrumbTrail(
-            page_url=page_url,
-            breadcrumbs=breadcrumb_data
-        )
-        self.db_session.add(record)
-        self.db_session.commit()
+        """Store a breadcrumb trail for a given page (buffered inside batch())."""
+        self._pending.append(self._row(page_url, trail))
+        if not self._batching or len(self._pending) >= self._batch_size:
+            self.flush()
         self.logger.debug(f"Recorded breadcrumb trail for {page_url} ({len(trail)} items)")
 
+    def record_trails_bulk(self, page_url: str, trails: List[List[Breadcrumb]]):
+        """Store all trails of a page with a single INSERT and commit."""
+        self._pending.extend(self._row(page_url, trail) for trail in trails)
+        self.flush()
+
+    def flush(self):
+        """Write buffered trails in one executemany INSERT and commit."""
+        if not self._pending:
+            return
+        self.db_session.execute(insert(BreadcrumbTrail), self._pending)
+        self.db_session.commit()
+        self._pending.clear()
+
+    @contextmanager
+    def batch(self):
+        """Buffer record_trail() calls, committing every batch_size trails and on exit."""
+        self._batching = True
+        try:
+            yield self
+        finally:
+            self._batching = False
+            self.flush()
+
     def get_trails_for_page(self, page_url: str) -> List[Dict]:
         records = self.db_session.query(BreadcrumbTrail).filter_by(page_url=page_url).all()
         return [r.breadcrumbs for r in records]
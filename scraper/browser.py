@@ -1,26 +1,52 @@
 """Browser automation with stealth capabilities."""
 
+from __future__ import annotations
+
 import asyncio
-from typing import Optional
-from playwright.async_api import async_playwright, Browser, Page, BrowserContext
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Set, TYPE_CHECKING
 from cendoj.scraper.fingerprint import FingerprintSpoofer
 from cendoj.utils.logger import get_logger
 
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, Page, BrowserContext
+
 logger = get_logger(__name__)
 
+# Script to mask automation
+WEBDRIVER_MASK_JS = """
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+"""
+
 class BrowserManager:
     """Manages browser instance with stealth capabilities."""
 
-    def __init__(self, headless: bool = True, stealth: bool = True):
+    def __init__(self, headless: bool = True, stealth: bool = True,
+                 pool_size: int = 1, rotate_after: int = 0):
         self.headless = headless
         self.stealth = stealth
         self.playwright = None
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.fingerprint_spoofer = FingerprintSpoofer() if stealth else None
+        # Idle pages kept open for reuse, and context rotation every N page checkouts (0 = never)
+        self.pool_size = pool_size
+        self.rotate_after = rotate_after
+        self._page_pool: asyncio.Queue = asyncio.Queue(maxsize=max(pool_size, 1))
+        self._checkouts = 0
+        # Checked-out pages per context; a rotated-out context stays open (retired)
+        # until the last of its pages is released
+        self._outstanding: Dict[BrowserContext, int] = {}
+        self._retired: Set[BrowserContext] = set()
 
     async def start(self):
         """Initialize browser with stealth settings."""
+        # Playwright is imported on first start so that importing this module
+        # (and everything that depends on it) stays cheap for non-browser paths
+        from playwright.async_api import async_playwright
+
         logger.info("Starting browser...")
         self.playwright = await async_playwright().start()
 
@@ -39,6 +65,12 @@ class BrowserManager:
             args=launch_args
         )
 
+        await self._open_context()
+        await self._fill_pool()
+        logger.info("Browser started successfully")
+
+    async def _open_context(self):
+        """Create the shared context and pre-warm the page pool."""
         # Create context with viewport and user agent
         context_options = {
             "viewport": {"width": 1920, "height": 1080},
@@ -49,18 +81,44 @@ class BrowserManager:
 
         self.context = await self.browser.new_context(**context_options)
 
-        # Apply fingerprint spoofing if enabled
+        # Fingerprint spoofing (if enabled) and the automation mask go in one init script
+        script = WEBDRIVER_MASK_JS
         if self.stealth and self.fingerprint_spoofer:
-            await self.fingerprint_spoofer.apply_to_context(self.context)
-
-        # Add script to mask automation
-        await self.context.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => undefined
-            });
-        """)
-
-        logger.info("Browser started successfully")
+            script = self.fingerprint_spoofer.render() + script
+            logger.info("Fingerprint spoofing applied")
+        await self.context.add_init_script(script)
+
+    async def _fill_pool(self):
+        """Pre-warm the page pool from the current context."""
+        for _ in range(self._page_pool.maxsize - self._page_pool.qsize()):
+            page = await self.context.new_page()
+            if self._page_pool.full():  # refilled by release_page() meanwhile
+                await page.close()
+                break
+            self._page_pool.put_nowait(page)
+
+    async def _drain_pool(self):
+        while not self._page_pool.empty():
+            page = self._page_pool.get_nowait()
+            if not page.is_closed():
+                await page.close()
+
+    async def rotate_context(self):
+        """Replace the context (new fingerprint) while keeping the browser process.
+
+        Pages already checked out keep working: their context is closed once
+        the last of them is released.
+        """
+        old = self.context
+        await self._open_context()
+        await self._drain_pool()  # idle pages of the old context
+        await self._fill_pool()
+        if old is not None:
+            if self._outstanding.get(old):
+                self._retired.add(old)
+            else:
+                await old.close()
+        logger.debug("Browser context rotated")
 
     async def new_page(self) -> Page:
         """Create a new page with stealth settings."""
@@ -70,12 +128,77 @@ class BrowserManager:
         page = await self.context.new_page()
         return page
 
+    async def checkout_page(self) -> Page:
+        """Take a page from the pool (or open one); hand it back with release_page()."""
+        if not self.context:
+            await self.start()
+
+        self._checkouts += 1
+        if self.rotate_after and self._checkouts % self.rotate_after == 0:
+            await self.rotate_context()
+
+        page = None
+        while not self._page_pool.empty():
+            candidate = self._page_pool.get_nowait()
+            if not candidate.is_closed():
+                page = candidate
+                break
+        if page is None:
+            page = await self.context.new_page()
+        self._outstanding[page.context] = self._outstanding.get(page.context, 0) + 1
+        return page
+
+    async def release_page(self, page: Page):
+        """Return a page to the pool, closing it if the pool is full or it is stale."""
+        context = page.context
+        remaining = self._outstanding.get(context, 1) - 1
+        if remaining > 0:
+            self._outstanding[context] = remaining
+        else:
+            self._outstanding.pop(context, None)
+
+        if context is not self.context:
+            if remaining <= 0 and context in self._retired:
+                self._retired.discard(context)
+                await context.close()
+            elif not page.is_closed():
+                await page.close()
+            return
+        if page.is_closed():
+            return
+        try:
+            # Don't pass per-visit headers (e.g. User-Agent) on to the next borrower
+            await page.set_extra_http_headers({})
+        except Exception as e:
+            logger.debug(f"Discarding page that failed to reset: {e}")
+            await page.close()
+            return
+        # Re-checked after the await: the pool may have filled or the context rotated
+        if page.context is self.context and not self._page_pool.full():
+            self._page_pool.put_nowait(page)
+        elif not page.is_closed():
+            await page.close()
+
+    @asynccontextmanager
+    async def acquire_page(self) -> AsyncIterator[Page]:
+        """Borrow a pooled page for the duration of the block."""
+        page = await self.checkout_page()
+        try:
+            yield page
+        finally:
+            await self.release_page(page)
+
     async def screenshot(self, page: Page, path: str):
         """Take screenshot for debugging."""
         await page.screenshot(path=path, full_page=True)
 
     async def stop(self):
         """Clean up browser resources."""
+        await self._drain_pool()
+        for context in self._retired:
+            await context.close()
+        self._retired.clear()
+        self._outstanding.clear()
         if self.context:
             await self.context.close()
         if self.browser:
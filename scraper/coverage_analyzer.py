@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
-from typing import Dict, List, Set, Optional
-from collections import defaultdict
-from dataclasses import dataclass, field
+from typing import Any, Dict, List, Set, Optional
+from collections import Counter
 from datetime import datetime
-import json
+import re
+import sys
+
+import orjson
+from sqlalchemy import func, select
 
 from cendoj.utils.logger import get_logger
 from cendoj.storage.database import get_session
@@ -15,64 +18,165 @@ from cendoj.storage.schemas import PDFLink, DiscoverySession
 
 logger = get_logger(__name__)
 
+# Rows fetched per round trip when loading the graph from the DB
+BUILD_BATCH_SIZE = 10_000
+
+# Year path segments in archive URLs, e.g. .../2019/...
+_YEAR_RE = re.compile(r'/(20\d{2})/')
+
 
-@dataclass
 class CoverageNode:
     """Represents a node in the coverage graph."""
-    url: str
-    depth: int = 0
-    strategy: str = 'unknown'
-    status: str = 'unknown'
-    children: Set[str] = field(default_factory=set)
+
+    # Graphs can hold millions of nodes; slots drop the per-instance __dict__
+    __slots__ = ('url', 'depth', 'strategy', 'status', 'children')
+
+    def __init__(self, url: str, depth: int = 0, strategy: str = 'unknown',
+                 status: str = 'unknown', children: Optional[Set[str]] = None):
+        self.url = url
+        self.depth = depth
+        self.strategy = strategy
+        self.status = status
+        self.children = children if children is not None else set()
+
+    def __repr__(self) -> str:
+        return (f"CoverageNode(url={self.url!r}, depth={self.depth!r}, strategy={self.strategy!r}, "
+                f"status={self.status!r}, children={self.children!r})")
 
 
 class CoverageGraph:
-    """Directed graph of discovered/crawled URLs."""
+    """Directed graph of discovered/crawled URLs.
+
+    Edges are collected in per-node child sets while the graph is built;
+    queries run on a CSR snapshot (int32 indptr/indices plus a URL table)
+    made by freeze() and dropped again on the next modification.
+    """
 
     def __init__(self):
         self.nodes: Dict[str, CoverageNode] = {}
+        self.in_degree: Dict[str, int] = {}  # only targets of at least one edge
+        self._id_to_url: List[str] = []
+        self._url_to_id: Dict[str, int] = {}
+        self._indptr = None
+        self._indices = None
 
     def add_node(self, url: str, **kwargs):
         if url not in self.nodes:
+            # strategy/status come from a tiny vocabulary: share one string object each
+            for key in ('strategy', 'status'):
+                if key in kwargs:
+                    kwargs[key] = sys.intern(kwargs[key])
             self.nodes[url] = CoverageNode(url=url, **kwargs)
+            self._indptr = None
 
     def add_edge(self, source: str, target: str):
         if source not in self.nodes:
             self.add_node(source)
         if target not in self.nodes:
             self.add_node(target)
-        self.nodes[source].children.add(target)
+        children = self.nodes[source].children
+        if target not in children:
+            children.add(target)
+            self.in_degree[target] = self.in_degree.get(target, 0) + 1
+            self._indptr = None
+
+    def freeze(self) -> CoverageGraph:
+        """Build the CSR snapshot of the edges."""
+        import numpy as np
+
+        id_to_url = list(self.nodes)
+        url_to_id = {url: i for i, url in enumerate(id_to_url)}
+        indptr = np.zeros(len(id_to_url) + 1, dtype=np.int32)
+        indices = []
+        for i, node in enumerate(self.nodes.values(), 1):
+            indices.extend(url_to_id[child] for child in node.children)
+            indptr[i] = len(indices)
+
+        self._id_to_url = id_to_url
+        self._url_to_id = url_to_id
+        self._indices = np.asarray(indices, dtype=np.int32)
+        self._indptr = indptr
+        return self
+
+    def _csr(self):
+        if self._indptr is None:
+            self.freeze()
+        return self._indptr, self._indices
+
+    def _frontier_ids(self):
+        import numpy as np
+        indptr, _ = self._csr()
+        return np.flatnonzero(np.diff(indptr) == 0)
 
     def get_frontier(self) -> List[str]:
         """Get nodes with no children (leaf nodes)."""
-        return [url for url, node in self.nodes.items() if not node.children]
+        ids = self._frontier_ids()
+        return [self._id_to_url[i] for i in ids]
+
+    def get_frontier_count(self) -> int:
+        """Number of leaf nodes, without building the list."""
+        return len(self._frontier_ids())
 
     def get_orphans(self) -> List[str]:
         """Get nodes with no incoming edges (except seeds)."""
         # For simplicity, nodes that are never a target
-        targets = set()
-        for node in self.nodes.values():
-            targets.update(node.children)
-        return [url for url in self.nodes if url not in targets]
+        in_degree = self.in_degree
+        return [url for url in self.nodes if url not in in_degree]
+
+    def get_orphan_count(self) -> int:
+        """Number of nodes with no incoming edges, without building the list."""
+        return len(self.nodes) - len(self.in_degree)
 
     def get_disconnected_components(self) -> List[Set[str]]:
-        """Find disconnected subgraphs."""
+        """Find disconnected (weakly connected) subgraphs."""
+        try:
+            return self._components_csgraph()
+        except ImportError:
+            return self._components_dfs()
+
+    def _components_csgraph(self) -> List[Set[str]]:
+        """Connected components via scipy's native csgraph (optional dependency)."""
+        import numpy as np
+        from scipy.sparse import csr_matrix
+        from scipy.sparse.csgraph import connected_components
+
+        indptr, indices = self._csr()
+        n = len(indptr) - 1
+        if not n:
+            return []
+        adjacency = csr_matrix((np.ones(len(indices), dtype=np.int8), indices, indptr), shape=(n, n))
+        _, labels = connected_components(adjacency, directed=True, connection='weak')
+
+        # Group node ids by component label
+        urls = self._id_to_url
+        order = np.argsort(labels, kind='stable')
+        bounds = np.flatnonzero(np.diff(labels[order])) + 1
+        return [{urls[i] for i in group} for group in np.split(order, bounds)]
+
+    def _components_dfs(self) -> List[Set[str]]:
+        """Pure-Python fallback: DFS over edges in both directions."""
+        neighbors = {url: set(node.children) for url, node in self.nodes.items()}
+        for url, node in self.nodes.items():
+            for child in node.children:
+                neighbors[child].add(url)
+
         visited = set()
         components = []
 
-        def dfs(node_url, component):
-            if node_url in visited:
-                return
-            visited.add(node_url)
-            component.add(node_url)
-            for child in self.nodes[node_url].children:
-                dfs(child, component)
-
+        # Explicit stack: long link chains would exceed the recursion limit
         for url in self.nodes:
-            if url not in visited:
-                component = set()
-                dfs(url, component)
-                components.append(component)
+            if url in visited:
+                continue
+            component = set()
+            stack = [url]
+            while stack:
+                node_url = stack.pop()
+                if node_url in visited:
+                    continue
+                visited.add(node_url)
+                component.add(node_url)
+                stack.extend(neighbors[node_url])
+            components.append(component)
 
         return components
 
@@ -88,44 +192,74 @@ class CoverageAnalyzer:
         """Build coverage graph from database."""
         db_session = get_session()
         try:
-            # Get all PDF links
-            query = db_session.query(PDFLink)
+            # Stream only the columns the graph needs, as plain rows
+            stmt = select(PDFLink.url, PDFLink.source_url, PDFLink.extraction_method, PDFLink.status)
             if session_id:
-                query = query.filter_by(discovery_session_id=session_id)
-            
-            pdf_links = query.all()
-            
-            for link in pdf_links:
-                source = link.source_url or 'unknown'
-                self.graph.add_node(
-                    link.url,
-                    strategy=link.extraction_method or 'unknown',
-                    status=link.status or 'unknown'
-                )
-                self.graph.add_edge(source, link.url)
-            
+                stmt = stmt.where(PDFLink.discovery_session_id == session_id)
+
+            add_node = self.graph.add_node
+            add_edge = self.graph.add_edge
+            for url, source_url, method, status in db_session.execute(stmt).yield_per(BUILD_BATCH_SIZE):
+                add_node(url, strategy=method or 'unknown', status=status or 'unknown')
+                add_edge(source_url or 'unknown', url)
+
+            self.graph.freeze()
             self.logger.info(f"Built coverage graph with {len(self.graph.nodes)} nodes")
             return self.graph
         finally:
             db_session.close()
 
-    def analyze_gaps(self) -> Dict[str, Any]:
+    def fast_gaps_summary(self, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Link counts computed by the database, without building the graph.
+
+        Use analyze_gaps_full() when graph metrics (frontier, orphans,
+        components) or recommendations are needed.
+        """
+        db_session = get_session()
+        try:
+            def grouped(column):
+                stmt = select(column, func.count()).group_by(column)
+                if session_id:
+                    stmt = stmt.where(PDFLink.discovery_session_id == session_id)
+                counts = Counter()
+                for value, count in db_session.execute(stmt):
+                    counts[value or 'unknown'] += count
+                return dict(counts)
+
+            status_distribution = grouped(PDFLink.status)
+            strategy_distribution = grouped(PDFLink.extraction_method)
+
+            # Links with no source page all hang off the 'unknown' node in the graph
+            unsourced = select(func.count()).select_from(PDFLink).where(PDFLink.source_url.is_(None))
+            if session_id:
+                unsourced = unsourced.where(PDFLink.discovery_session_id == session_id)
+
+            return {
+                'total_links': sum(status_distribution.values()),
+                'unsourced_links': db_session.execute(unsourced).scalar_one(),
+                'status_distribution': status_distribution,
+                'strategy_distribution': strategy_distribution,
+            }
+        finally:
+            db_session.close()
+
+    def analyze_gaps_full(self) -> Dict[str, Any]:
         """Analyze the graph to identify coverage gaps."""
+        nodes = self.graph.nodes
+        status_counts = Counter(node.status for node in nodes.values())
+        strategy_counts = Counter(node.strategy for node in nodes.values())
+
         gaps = {
-            'total_nodes': len(self.graph.nodes),
-            'frontier_count': len(self.graph.get_frontier()),
-            'orphan_count': len(self.graph.get_orphans()),
+            'total_nodes': len(nodes),
+            'frontier_count': self.graph.get_frontier_count(),
+            'orphan_count': self.graph.get_orphan_count(),
             'disconnected_components': len(self.graph.get_disconnected_components()),
-            'status_distribution': defaultdict(int),
-            'strategy_distribution': defaultdict(int),
+            'status_distribution': status_counts,
+            'strategy_distribution': strategy_counts,
             'recommendations': [],
         }
 
-        # Status distribution
-        for node in self.graph.nodes.values():
-            gaps['status_distribution'][node.status] += 1
-            gaps['strategy_distribution'][node.strategy] += 1
-
         # Generate recommendations
         if gaps['disconnected_components'] > 1:
             gaps['recommendations'].append(
@@ -149,21 +283,16 @@ class CoverageAnalyzer:
                     "consider adding archive probes for these years"
                 )
 
-        gaps['status_distribution'] = dict(gaps['status_distribution'])
-        gaps['strategy_distribution'] = dict(gaps['strategy_distribution'])
+        gaps['status_distribution'] = dict(status_counts)
+        gaps['strategy_distribution'] = dict(strategy_counts)
         return gaps
 
     def _extract_years(self) -> Set[int]:
         """Extract years from URLs."""
-        import re
-        years = set()
-        year_pattern = re.compile(r'/(20\d{2})/')
-        for url in self.graph.nodes:
-            for match in year_pattern.finditer(url):
-                year = int(match.group(1))
-                if 1990 <= year <= datetime.now().year:
-                    years.add(year)
-        return years
+        # One regex pass over all URLs; the newline separator can't be part of a match
+        blob = '\n'.join(self.graph.nodes)
+        current_year = datetime.now().year
+        return {year for year in map(int, set(_YEAR_RE.findall(blob))) if 1990 <= year <= current_year}
 
     def _find_missing_years(self, found_years: Set[int]) -> List[int]:
         """Find missing years in a range."""
@@ -177,7 +306,7 @@ class CoverageAnalyzer:
     def generate_report(self, session_id: Optional[str] = None) -> str:
         """Generate a text report of coverage analysis."""
         self.build_from_db(session_id)
-        gaps = self.analyze_gaps()
+        gaps = self.analyze_gaps_full()
 
         report = ["=" * 50, "COVERAGE ANALYSIS REPORT", "=" * 50, ""]
         report.append(f"Total nodes: {gaps['total_nodes']}")
@@ -205,19 +334,18 @@ class CoverageAnalyzer:
 
     def save_snapshot(self, filepath: str):
         """Save graph snapshot to JSON file."""
-        data = {
-            'timestamp': datetime.utcnow().isoformat(),
-            'nodes': [
-                {
+        # Same JSON document as before, streamed one node per line
+        header = orjson.dumps({'timestamp': datetime.utcnow().isoformat()})
+        with open(filepath, 'wb') as f:
+            f.write(header[:-1] + b',"nodes":[')
+            for i, node in enumerate(self.graph.nodes.values()):
+                f.write(b'\n' if i == 0 else b',\n')
+                f.write(orjson.dumps({
                     'url': node.url,
                     'depth': node.depth,
                     'strategy': node.strategy,
                     'status': node.status,
                     'children': list(node.children),
-                }
-                for node in self.graph.nodes.values()
-            ]
-        }
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+                }))
+            f.write(b'\n]}\n')
         self.logger.info(f"Coverage snapshot saved to {filepath}")
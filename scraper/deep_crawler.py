@@ -1,25 +1,80 @@
 """Deep crawler for exhaustive PDF link discovery using BFS."""
 
+from __future__ import annotations
+
 import asyncio
 import re
 from collections import deque
-from typing import List, Dict, Any, Optional, Set
-from urllib.parse import urljoin, urlparse
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple, Iterable, AsyncIterable, Union, TYPE_CHECKING
+from urllib.parse import urljoin, urlparse, urlsplit
 from datetime import datetime
 from pathlib import Path
-import pickle
+import os
 
-from playwright.async_api import Page
+import orjson
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from cendoj.scraper.models import Sentence
 from cendoj.scraper.browser import BrowserManager
 from cendoj.utils.logger import get_logger
+from cendoj.utils.bloom_filter import BloomFilter
 from cendoj.storage.database import get_session
 from cendoj.storage.schemas import PDFLink, BreadcrumbTrail
-from cendoj.scraper.breadcrumbs import BreadcrumbExtractor
+from cendoj.scraper.breadcrumbs import BreadcrumbExtractor, BreadcrumbDBRecorder
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
 
 logger = get_logger(__name__)
 
+# PDF URLs embedded anywhere in page HTML / scripts. google-re2 (optional)
+# matches in linear time with a DFA instead of backtracking, which matters
+# when scanning whole documents on every page.
+try:
+    import re2 as _pdf_re
+except ImportError:
+    _pdf_re = re
+
+PDF_URL_RE = _pdf_re.compile(r'(?i)https?://[^\s"\'<>]+\.pdf')
+
+# In-page extraction scripts: each returns plain strings in a single
+# round trip instead of one get_attribute()/text_content() call per element
+PDF_HREFS_JS = "() => Array.from(document.querySelectorAll(\"a[href$='.pdf']\"), a => a.getAttribute('href'))"
+ANCHOR_HREFS_JS = "limit => Array.from(document.querySelectorAll('a[href]'), a => a.getAttribute('href')).slice(0, limit)"
+SCRIPTS_TEXT_JS = "() => Array.from(document.scripts, s => s.textContent).join('\\n')"
+
+
+# Internal links to these files are not crawled as pages
+SKIP_LINK_EXTENSIONS = ('.pdf', '.jpg', '.jpeg', '.png', '.gif', '.zip', '.doc', '.docx')
+
+# Bounded memo for normalize_url; each URL is normalized several times per crawl step
+NORMALIZE_CACHE_SIZE = 100_000
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize_url(url: str) -> str:
+    """
+    Normalize URL for deduplication.
+
+    Lowercases and keeps only scheme, host and path (query, fragment and
+    ";params" of the last path segment are dropped, as urlparse would).
+    Uses urlsplit, which skips urlparse's extra params pass on every URL.
+
+    Args:
+        url: Raw URL
+
+    Returns:
+        Normalized URL
+    """
+    scheme, netloc, path, _, _ = urlsplit(url.lower())
+    if ';' in path:
+        semi = path.find(';', path.rfind('/'))
+        if semi >= 0:
+            path = path[:semi]
+    return f"{scheme}://{netloc}{path}"
+
 
 class DeepCrawler:
     """Breadth-first deep crawler for discovering PDF links."""
@@ -32,7 +87,8 @@ class DeepCrawler:
         ua_pool=None,
         rate_limiter=None,
         captcha_handler=None,
-        behavior_sim=None
+        behavior_sim=None,
+        http_session=None
     ):
         """
         Initialize DeepCrawler.
@@ -45,6 +101,7 @@ class DeepCrawler:
             rate_limiter: Optional AdaptiveRateLimiter
             captcha_handler: Optional CAPTCHAHandler
             behavior_sim: Optional BehaviorSimulator
+            http_session: Optional shared aiohttp.ClientSession (not closed here)
         """
         self.browser_manager = browser_manager
         self.config = config
@@ -55,10 +112,17 @@ class DeepCrawler:
         self.behavior_sim = behavior_sim
 
         # State
-        self.visited_urls: Set[str] = set()
-        self.queue = deque()  # (url, depth, source_url, extraction_method)
+        self.visited_urls = self._new_visited_set()  # normalized URLs (set or BloomFilter)
+        self.queue = deque()  # (url, normalized_url, depth, source_url, extraction_method)
+        self._in_flight: Dict[str, tuple] = {}  # normalized url -> queue item being visited
+        self._seed_task: Optional[asyncio.Task] = None  # feeds async seed iterators, see _feed_seeds()
+        self._seeds_queued: Optional[asyncio.Event] = None
         self.max_depth = config.discovery_max_depth
+        self.current_depth = 0  # deepest BFS level dispatched so far
         self.session_id = None
+        self._shared_http_session = http_session
+        self._http_session = None  # aiohttp.ClientSession, see _get_http_session()
+        self._head_timeout = None
 
         # Stats
         self.stats = {
@@ -69,29 +133,68 @@ class DeepCrawler:
             'captchas': 0,
         }
 
-        # Persistence
+        # Persistence: queue/stats snapshot (rewritten) + visited log (append-only)
         self.state_file = None
+        self.visited_file = None
+        self._visited_since_save: List[str] = []
         self.save_interval = 100  # pages
 
-    async def initialize(self, session_id: str, seed_urls: List[str]):
-        """Initialize crawler state."""
+    async def initialize(self, session_id: str, seed_urls: Union[Iterable[str], AsyncIterable[str]]):
+        """
+        Initialize crawler state.
+
+        seed_urls may be a plain iterable or an async iterator. An async
+        iterator is consumed in the background, so crawl() can start on the
+        first seeds while later ones are still being produced.
+        """
         self.session_id = session_id
 
         # Load state if resuming
-        self.state_file = Path(self.config.session_dir) / f"crawler_state_{session_id}.pkl"
+        session_dir = Path(self.config.session_dir)
+        self.state_file = session_dir / f"crawler_state_{session_id}.json"
+        self.visited_file = session_dir / f"crawler_visited_{session_id}.txt"
         if self.state_file.exists():
             await self._load_state()
             logger.info(f"Resumed from saved state: {len(self.visited_urls)} visited, {len(self.queue)} queued")
         else:
+            # A visited log without a snapshot is left over from a run that never saved
+            self.visited_file.unlink(missing_ok=True)
             # Seed initial URLs
-            for url in seed_urls:
-                self.queue.append((url, 0, None, "seed"))
-            logger.info(f"Initialized crawler with {len(seed_urls)} seed URLs")
+            if hasattr(seed_urls, '__aiter__'):
+                self._seeds_queued = asyncio.Event()
+                self._seed_task = asyncio.ensure_future(self._feed_seeds(seed_urls))
+            else:
+                for url in seed_urls:
+                    self.queue.append((url, normalize_url(url), 0, None, "seed"))
+                logger.info(f"Initialized crawler with {len(self.queue)} seed URLs")
+
+    async def _feed_seeds(self, seed_urls: AsyncIterable[str]):
+        """Queue seeds from an async iterator as they are produced."""
+        count = 0
+        try:
+            async for url in seed_urls:
+                self.queue.append((url, normalize_url(url), 0, None, "seed"))
+                count += 1
+                self._seeds_queued.set()
+            logger.info(f"Initialized crawler with {count} seed URLs")
+        except Exception as e:
+            logger.error(f"Seed generation failed after {count} URLs: {e}", exc_info=True)
+        finally:
+            # Wake crawl() so it notices the feed is over
+            self._seeds_queued.set()
+
+    def _seeding(self) -> bool:
+        """Whether seeds may still arrive from _feed_seeds()."""
+        return self._seed_task is not None and not self._seed_task.done()
 
     async def crawl(self) -> List[Dict[str, Any]]:
         """
         Main crawl loop.
 
+        Up to discovery.concurrency pages are visited at once (all sharing
+        the BFS queue and the DB session); PDFs are yielded as each page
+        finishes.
+
         Yields:
             Dict with PDF metadata: {
                 'url': str,
@@ -102,141 +205,197 @@ class DeepCrawler:
             }
         """
         db_session = get_session()
+        concurrency = max(1, self.config.discovery_concurrency)
+        # Running visits -> normalized URL. A page stays in _in_flight until all its
+        # PDFs have been yielded, so one the consumer stopped before is saved as queued
+        tasks: Dict[asyncio.Task, str] = {}
+        seed_wait: Optional[asyncio.Future] = None
 
         try:
-            while self.queue:
-                url, depth, source_url, method = self.queue.popleft()
-
-                # Skip if already visited
-                if self._normalize_url(url) in self.visited_urls:
-                    continue
-
-                # Check depth limit (0 = unlimited)
-                if self.max_depth > 0 and depth >= self.max_depth:
-                    logger.debug(f"Skipping {url}: depth {depth} >= max {self.max_depth}")
-                    continue
-
-                # Respect rate limiting
-                if self.rate_limiter:
-                    await self.rate_limiter.wait()
-
-                # Get proxy and UA
-                proxy = self.proxy_manager.get_next_proxy() if self.proxy_manager else None
-                user_agent = self.ua_pool.get_random() if self.ua_pool else None
-
-                # Visit page
-                try:
-                    # Fast path: if URL is a direct PDF, validate and yield without browser
-                    if url.lower().endswith('.pdf'):
-                        validation = await self._validate_url(url) if self.config.discovery_validate_on_discovery else {}
-                        pdf_data = {
-                            'url': url,
-                            'source_url': source_url,
-                            'depth': depth,
-                            'method': method,
-                            'validation': validation,
-                        }
-                        # Store to DB
-                        pdf_link = await self._store_pdf_link(pdf_data, db_session)
-                        if pdf_link:
-                            pdf_data['db_id'] = pdf_link.id
-                            if self.config.discovery_validate_on_discovery:
-                                pdf_link.status = 'accessible' if validation.get('accessible') else 'broken'
-                                pdf_link.validated_at = datetime.utcnow()
-                                pdf_link.http_status = validation.get('status')
-                                pdf_link.content_length = validation.get('content_length')
-                                db_session.commit()
-                        self.stats['pdfs_found'] += 1
-                        yield pdf_data
-                        self.visited_urls.add(self._normalize_url(url))
+            while self.queue or tasks or self._seeding():
+                # Fill free worker slots from the BFS queue
+                while self.queue and len(tasks) < concurrency:
+                    item = self.queue.popleft()
+                    url, normalized, depth = item[0], item[1], item[2]
+
+                    # Skip if already visited (or being visited by another worker)
+                    if normalized in self.visited_urls or normalized in self._in_flight:
                         continue
 
-                    page = await self.browser_manager.new_page()
-
-                    # Set user agent if provided
-                    if user_agent:
-                        await page.set_extra_http_headers({"User-Agent": user_agent})
-
-                    # Navigate with proxy
-                    logger.debug(f"Visiting: {url} (depth={depth}, proxy={proxy.proxy_url if proxy else 'none'})")
-
-                    # Navigate
-                    response = await page.goto(url, timeout=self.config.browser_config.get('timeout', 60000))
-                    if response and response.status >= 400:
-                        logger.warning(f"HTTP {response.status} for {url}")
-                        await page.close()
+                    # Check depth limit (0 = unlimited)
+                    if self.max_depth > 0 and depth >= self.max_depth:
+                        logger.debug(f"Skipping {url}: depth {depth} >= max {self.max_depth}")
                         continue
 
-                    # Check for CAPTCHA
-                    if self.captcha_handler:
-                        should_skip = await self.captcha_handler.should_skip_url(page, self.session_id)
-                        if should_skip:
-                            self.stats['captchas'] += 1
-                            await page.close()
-                            continue
-
-                    # Simulate human behavior
-                    if self.behavior_sim and depth == 0:  # Only on seed pages
-                        await self.behavior_sim.simulate_page_interaction(page)
-
-                    # Extract PDFs from this page
-                    pdf_links = await self._extract_pdfs_from_page(page, url, depth)
-                    for pdf_data in pdf_links:
-                        self.stats['pdfs_found'] += 1
-
-                        # Save to database
-                        pdf_link = await self._store_pdf_link(pdf_data, db_session)
-                        pdf_data['db_id'] = pdf_link.id if pdf_link else None
-
-                        # Validate if configured
-                        if self.config.discovery_validate_on_discovery:
-                            validation = await self._validate_url(pdf_data['url'])
-                            pdf_data['validation'] = validation
-                            if pdf_link:
-                                pdf_link.status = 'accessible' if validation.get('accessible') else 'broken'
-                                pdf_link.validated_at = datetime.utcnow()
-                                pdf_link.http_status = validation.get('status')
-                                pdf_link.content_length = validation.get('content_length')
-                                db_session.commit()
-
+                    if depth > self.current_depth:
+                        self.current_depth = depth
+                    self._in_flight[normalized] = item
+                    tasks[asyncio.ensure_future(self._visit(item, db_session))] = normalized
+
+                waiting = set(tasks)
+                if self._seeding() and len(tasks) < concurrency:
+                    # Queue drained before the seed feed finished: also wake on new seeds
+                    self._seeds_queued.clear()
+                    seed_wait = asyncio.ensure_future(self._seeds_queued.wait())
+                    waiting.add(seed_wait)
+                if not waiting:
+                    break
+
+                done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                if seed_wait is not None:
+                    seed_wait.cancel()
+                    done.discard(seed_wait)
+                    seed_wait = None
+                for task in done:
+                    normalized = tasks.pop(task)
+                    found, visited = task.result()
+                    for pdf_data in found:
                         yield pdf_data
-
-                    # Extract and record breadcrumbs for this page
-                    try:
-                        await self._extract_and_record_breadcrumbs(page, url, db_session)
-                    except Exception as exc:
-                        logger.debug(f"Breadcrumb extraction failed for {url}: {exc}")
-
-                    # Extract internal links for BFS (if not at max depth)
-                    if (self.max_depth == 0 or depth < self.max_depth) and self.config.discovery_follow_internal_links:
-                        internal_links = await self._extract_internal_links(page, url)
-                        for link in internal_links:
-                            normalized = self._normalize_url(link)
-                            if normalized not in self.visited_urls:
-                                self.queue.append((link, depth + 1, url, "internal_link"))
-                                self.stats['internal_links_found'] += 1
-
-                    await page.close()
-
-                    # Mark as visited
-                    self.visited_urls.add(self._normalize_url(url))
-                    self.stats['pages_visited'] += 1
-
-                    # Periodic state save
-                    if self.stats['pages_visited'] % self.save_interval == 0:
-                        await self._save_state()
-                        logger.info(f"Progress: {self.stats['pages_visited']} pages, {self.stats['pdfs_found']} PDFs found")
-
-                except Exception as e:
-                    logger.error(f"Error visiting {url}: {e}")
-                    self.stats['errors'] += 1
-                    continue
+                    if visited:
+                        self._mark_visited(normalized)
+                    self._in_flight.pop(normalized, None)
 
         finally:
+            if seed_wait is not None:
+                seed_wait.cancel()
+            # Unfinished visits stay in _in_flight, so the final save queues them for a resume
+            pending = list(tasks)
+            if self._seeding():
+                pending.append(self._seed_task)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
             db_session.close()
+            await self.close()
             await self._save_state()
             logger.info(f"Crawl finished: {self.stats}")
 
+    async def _visit(self, item: tuple, db_session) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Visit one queued URL.
+
+        Returns the PDF dicts found there and whether the page was fully
+        processed; crawl() marks it visited once those PDFs are yielded.
+        """
+        url, normalized_url, depth, source_url, method = item
+        found = []
+        visited = False
+        page = None
+
+        try:
+            # Respect rate limiting
+            if self.rate_limiter:
+                await self.rate_limiter.wait()
+
+            # Get proxy and UA
+            proxy = self.proxy_manager.get_next_proxy() if self.proxy_manager else None
+            user_agent = self.ua_pool.get_random() if self.ua_pool else None
+
+            # Fast path: if URL is a direct PDF, validate and return it without browser
+            if url.lower().endswith('.pdf'):
+                validation = await self._validate_url(url) if self.config.discovery_validate_on_discovery else {}
+                pdf_data = {
+                    'url': url,
+                    'normalized_url': normalized_url,
+                    'source_url': source_url,
+                    'depth': depth,
+                    'method': method,
+                    'validation': validation,
+                }
+                # Store to DB
+                pdf_link = await self._store_pdf_link(pdf_data, db_session)
+                if pdf_link:
+                    pdf_data['db_id'] = pdf_link.id
+                    if self.config.discovery_validate_on_discovery:
+                        pdf_link.status = 'accessible' if validation.get('accessible') else 'broken'
+                        pdf_link.validated_at = datetime.utcnow()
+                        pdf_link.http_status = validation.get('status')
+                        pdf_link.content_length = validation.get('content_length')
+                        db_session.commit()
+                self.stats['pdfs_found'] += 1
+                found.append(pdf_data)
+                return found, True
+
+            page = await self.browser_manager.checkout_page()
+
+            # Set user agent if provided
+            if user_agent:
+                await page.set_extra_http_headers({"User-Agent": user_agent})
+
+            # Navigate with proxy
+            logger.debug(f"Visiting: {url} (depth={depth}, proxy={proxy.proxy_url if proxy else 'none'})")
+
+            # Navigate
+            response = await page.goto(url, timeout=self.config.browser_config.get('timeout', 60000))
+            if response and response.status >= 400:
+                logger.warning(f"HTTP {response.status} for {url}")
+                return found, visited
+
+            # Check for CAPTCHA
+            if self.captcha_handler:
+                should_skip = await self.captcha_handler.should_skip_url(page, self.session_id)
+                if should_skip:
+                    self.stats['captchas'] += 1
+                    return found, visited
+
+            # Simulate human behavior
+            if self.behavior_sim and depth == 0:  # Only on seed pages
+                await self.behavior_sim.simulate_page_interaction(page)
+
+            # Extract PDFs from this page
+            pdf_links = await self._extract_pdfs_from_page(page, url, depth)
+
+            # Save to database (one query + one commit for the whole page)
+            stored_links = await self._store_pdf_links_batch(pdf_links, db_session)
+            for pdf_data, pdf_link in zip(pdf_links, stored_links):
+                self.stats['pdfs_found'] += 1
+
+                # Validate if configured
+                if self.config.discovery_validate_on_discovery:
+                    validation = await self._validate_url(pdf_data['url'])
+                    pdf_data['validation'] = validation
+                    if pdf_link:
+                        pdf_link.status = 'accessible' if validation.get('accessible') else 'broken'
+                        pdf_link.validated_at = datetime.utcnow()
+                        pdf_link.http_status = validation.get('status')
+                        pdf_link.content_length = validation.get('content_length')
+                        db_session.commit()
+
+                found.append(pdf_data)
+
+            # Extract and record breadcrumbs for this page
+            try:
+                await self._extract_and_record_breadcrumbs(page, url, db_session)
+            except Exception as exc:
+                logger.debug(f"Breadcrumb extraction failed for {url}: {exc}")
+
+            # Extract internal links for BFS (if not at max depth)
+            if (self.max_depth == 0 or depth < self.max_depth) and self.config.discovery_follow_internal_links:
+                internal_links = await self._extract_internal_links(page, url)
+                for link, normalized in internal_links:
+                    if normalized not in self.visited_urls:
+                        self.queue.append((link, normalized, depth + 1, url, "internal_link"))
+                        self.stats['internal_links_found'] += 1
+
+            visited = True
+            self.stats['pages_visited'] += 1
+
+            # Periodic state save
+            if self.stats['pages_visited'] % self.save_interval == 0:
+                await self._save_state()
+                logger.info(f"Progress: {self.stats['pages_visited']} pages, {self.stats['pdfs_found']} PDFs found")
+
+        except Exception as e:
+            logger.error(f"Error visiting {url}: {e}")
+            self.stats['errors'] += 1
+
+        finally:
+            if page is not None:
+                await self.browser_manager.release_page(page)
+
+        return found, visited
+
     async def _extract_pdfs_from_page(self, page: Page, source_url: str, depth: int) -> List[Dict[str, Any]]:
         """
         Extract ALL PDF links from a page using multiple methods.
@@ -253,9 +412,7 @@ class DeepCrawler:
 
         # Method 1: CSS selector (configured)
         try:
-            pdf_links = await page.query_selector_all("a[href$='.pdf']")
-            for el in pdf_links:
-                href = await el.get_attribute('href')
+            for href in await page.evaluate(PDF_HREFS_JS):
                 if href:
                     full_url = urljoin(source_url, href)
                     pdfs.append({
@@ -268,46 +425,45 @@ class DeepCrawler:
         except Exception as e:
             logger.debug(f"CSS selector extraction failed: {e}")
 
-        # Method 2: Regex scan of entire HTML (fallback)
-        try:
-            content = await page.content()
-            pdf_matches = re.findall(r'https?://[^\s"\'<>]+\.pdf', content, re.IGNORECASE)
-            for match in pdf_matches:
-                pdfs.append({
-                    'url': match,
-                    'source_url': source_url,
-                    'depth': depth,
-                    'method': 'regex_fallback',
-                    'confidence': 0.7,
-                })
-        except Exception as e:
-            logger.debug(f"Regex extraction failed: {e}")
-
-        # Method 3: Scan script tags for PDF URLs
-        try:
-            scripts = await page.query_selector_all("script")
-            for script in scripts:
-                script_content = await script.text_content()
-                if script_content:
-                    pdf_matches = re.findall(r'https?://[^\s"\'<>]+\.pdf', script_content, re.IGNORECASE)
-                    for match in pdf_matches:
-                        pdfs.append({
-                            'url': match,
-                            'source_url': source_url,
-                            'depth': depth,
-                            'method': 'script_scan',
-                            'confidence': 0.6,
-                        })
-        except Exception as e:
-            logger.debug(f"Script scan extraction failed: {e}")
+        # Method 2: Regex scan of entire HTML (opt-in). The serialized HTML
+        # already contains every script body, so it replaces Method 3.
+        if self.config.discovery_regex_fallback:
+            try:
+                content = await page.content()
+                for match in PDF_URL_RE.findall(content):
+                    pdfs.append({
+                        'url': match,
+                        'source_url': source_url,
+                        'depth': depth,
+                        'method': 'regex_fallback',
+                        'confidence': 0.7,
+                    })
+            except Exception as e:
+                logger.debug(f"Regex extraction failed: {e}")
+
+        # Method 3: Scan script tags for PDF URLs (all script bodies in one string)
+        elif self.config.discovery_extract_from_scripts:
+            try:
+                scripts_text = await page.evaluate(SCRIPTS_TEXT_JS)
+                for match in PDF_URL_RE.findall(scripts_text):
+                    pdfs.append({
+                        'url': match,
+                        'source_url': source_url,
+                        'depth': depth,
+                        'method': 'script_scan',
+                        'confidence': 0.6,
+                    })
+            except Exception as e:
+                logger.debug(f"Script scan extraction failed: {e}")
 
         # Deduplicate by URL
         seen = set()
         unique_pdfs = []
         for pdf in pdfs:
-            normalized = self._normalize_url(pdf['url'])
+            normalized = normalize_url(pdf['url'])
             if normalized not in seen:
                 seen.add(normalized)
+                pdf['normalized_url'] = normalized
                 unique_pdfs.append(pdf)
 
         return unique_pdfs
@@ -317,13 +473,12 @@ class DeepCrawler:
         try:
             content = await page.content()
             trails = BreadcrumbExtractor.extract(content, base_url=page_url)
-            recorder = BreadcrumbDBRecorder(db_session)
-            for trail in trails:
-                recorder.record_trail(page_url, trail)
+            if trails:
+                BreadcrumbDBRecorder(db_session).record_trails_bulk(page_url, trails)
         except Exception as e:
             logger.debug(f"Breadcrumb extraction/record failed: {e}")
 
-    async def _extract_internal_links(self, page: Page, base_url: str) -> List[str]:
+    async def _extract_internal_links(self, page: Page, base_url: str) -> List[Tuple[str, str]]:
         """
         Extract internal links for BFS crawling.
 
@@ -332,17 +487,15 @@ class DeepCrawler:
             base_url: Base URL for resolution
 
         Returns:
-            List of absolute URLs to internal pages
+            List of (absolute URL, normalized URL) pairs for internal pages
         """
         links = []
+        base_netloc = urlparse(base_url).netloc
 
         try:
-            # Get all <a> elements
-            anchor_elements = await page.query_selector_all("a[href]")
-
-            for el in anchor_elements[:200]:  # Limit to avoid explosion
+            # Get the href of every <a> element (first 200, to avoid explosion)
+            for href in await page.evaluate(ANCHOR_HREFS_JS, 200):
                 try:
-                    href = await el.get_attribute('href')
                     if not href:
                         continue
 
@@ -350,22 +503,21 @@ class DeepCrawler:
                     absolute_url = urljoin(base_url, href)
 
                     # Parse and check if it's internal (same domain)
-                    parsed_base = urlparse(base_url)
                     parsed_link = urlparse(absolute_url)
 
                     # Skip if different domain (external)
-                    if parsed_link.netloc and parsed_link.netloc != parsed_base.netloc:
+                    if parsed_link.netloc and parsed_link.netloc != base_netloc:
                         continue
 
                     # Skip common non-html extensions
-                    if any(ext in parsed_link.path.lower() for ext in ['.pdf', '.jpg', '.jpeg', '.png', '.gif', '.zip', '.doc', '.docx']):
+                    if parsed_link.path.lower().endswith(SKIP_LINK_EXTENSIONS):
                         continue
 
                     # Skip fragments, javascript, mailto
                     if parsed_link.fragment or absolute_url.startswith(('javascript:', 'mailto:', 'tel:')):
                         continue
 
-                    links.append(absolute_url)
+                    links.append((absolute_url, normalize_url(absolute_url)))
 
                 except Exception:
                     continue
@@ -376,6 +528,30 @@ class DeepCrawler:
         logger.debug(f"Found {len(links)} internal links on {base_url}")
         return links[:100]  # Limit per page to avoid explosion
 
+    def stats_snapshot(self) -> Dict[str, int]:
+        """Copy of the crawl counters, taken in one step."""
+        return dict(self.stats)
+
+    def _get_http_session(self):
+        """aiohttp session for HEAD validation: the injected one, or our own (created on first use)."""
+        import aiohttp
+        if self._head_timeout is None:
+            self._head_timeout = aiohttp.ClientTimeout(total=self.config.validate_url_timeout)
+        if self._shared_http_session is not None:
+            return self._shared_http_session
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300),
+                timeout=self._head_timeout,
+            )
+        return self._http_session
+
+    async def close(self):
+        """Close our own HTTP session (an injected one is left to its owner)."""
+        if self._http_session is not None:
+            await self._http_session.close()
+            self._http_session = None
+
     async def _validate_url(self, url: str) -> Dict[str, Any]:
         """Validate a PDF URL with HEAD request."""
         result = {
@@ -387,25 +563,23 @@ class DeepCrawler:
         }
 
         try:
-            import aiohttp
             proxy = None
             if self.proxy_manager:
                 proxy_rec = self.proxy_manager.get_next_proxy()
                 if proxy_rec:
                     proxy = proxy_rec.proxy_url
 
-            timeout = aiohttp.ClientTimeout(total=self.config.validate_url_timeout)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                headers = {"User-Agent": self.ua_pool.get_random()} if self.ua_pool else {}
-                async with session.head(url, proxy=proxy, headers=headers, allow_redirects=True) as resp:
-                    result['accessible'] = resp.status == 200
-                    result['status'] = resp.status
-                    result['content_type'] = resp.headers.get('Content-Type')
-                    result['content_length'] = int(resp.headers.get('Content-Length', 0)) if resp.headers.get('Content-Length') else None
+            session = self._get_http_session()
+            headers = {"User-Agent": self.ua_pool.get_random()} if self.ua_pool else {}
+            async with session.head(url, proxy=proxy, headers=headers, allow_redirects=True, timeout=self._head_timeout) as resp:
+                result['accessible'] = resp.status == 200
+                result['status'] = resp.status
+                result['content_type'] = resp.headers.get('Content-Type')
+                result['content_length'] = int(resp.headers.get('Content-Length', 0)) if resp.headers.get('Content-Length') else None
 
-                    if proxy and self.proxy_manager:
-                        proxy_rec = self.proxy_manager.get_next_proxy()  # Get the same proxy? FIXME
-                        self.proxy_manager.mark_result(proxy_rec, resp.status == 200)
+                if proxy and self.proxy_manager:
+                    proxy_rec = self.proxy_manager.get_next_proxy()  # Get the same proxy? FIXME
+                    self.proxy_manager.mark_result(proxy_rec, resp.status == 200)
 
         except Exception as e:
             result['error'] = str(e)
@@ -415,32 +589,35 @@ class DeepCrawler:
     async def _store_pdf_link(self, pdf_data: Dict[str, Any], db_session) -> Optional[PDFLink]:
         """Store discovered PDF link in database."""
         try:
-            normalized = self._normalize_url(pdf_data['url'])
+            normalized = pdf_data.get('normalized_url') or normalize_url(pdf_data['url'])
+
+            # Single round trip: the unique index on normalized_url rejects duplicates
+            stmt = (
+                sqlite_insert(PDFLink)
+                .values(
+                    url=pdf_data['url'],
+                    normalized_url=normalized,
+                    source_url=pdf_data['source_url'],
+                    discovery_session_id=self.session_id,
+                    discovered_at=datetime.utcnow(),
+                    status='discovered',
+                    extraction_method=pdf_data.get('method', 'unknown'),
+                    extraction_confidence=pdf_data.get('confidence', 1.0),
+                    metadata_json={
+                        'depth': pdf_data.get('depth', 0),
+                        'source': pdf_data.get('source_url'),
+                    }
+                )
+                .on_conflict_do_nothing(index_elements=['normalized_url'])
+                .returning(PDFLink)
+            )
+            pdf_link = db_session.scalar(stmt)
+            db_session.commit()
 
-            # Check if already exists
-            existing = db_session.query(PDFLink).filter_by(normalized_url=normalized).first()
-            if existing and self.config.discovery_deduplicate:
+            if pdf_link is None:
                 logger.debug(f"Duplicate PDF URL: {normalized}")
                 return None
 
-            pdf_link = PDFLink(
-                url=pdf_data['url'],
-                normalized_url=normalized,
-                source_url=pdf_data['source_url'],
-                discovery_session_id=self.session_id,
-                discovered_at=datetime.utcnow(),
-                status='discovered',
-                extraction_method=pdf_data.get('method', 'unknown'),
-                extraction_confidence=pdf_data.get('confidence', 1.0),
-                metadata_json={
-                    'depth': pdf_data.get('depth', 0),
-                    'source': pdf_data.get('source_url'),
-                }
-            )
-
-            db_session.add(pdf_link)
-            db_session.commit()
-
             logger.info(f"Stored PDF link: {pdf_data['url'][:100]}...")
             return pdf_link
 
@@ -449,6 +626,77 @@ class DeepCrawler:
             db_session.rollback()
             return None
 
+    async def _store_pdf_links_batch(self, pdf_datas: List[Dict[str, Any]], db_session) -> List[Optional[PDFLink]]:
+        """
+        Store the PDF links found on one page.
+
+        Returns a list aligned with pdf_datas holding the stored PDFLink,
+        or None for URLs that already exist (normalized_url is unique).
+        Every pdf_data gets its row id in 'db_id', new or existing.
+        """
+        if not pdf_datas:
+            return []
+
+        try:
+            normalized = [pdf_data.get('normalized_url') or normalize_url(pdf_data['url']) for pdf_data in pdf_datas]
+
+            rows = {}  # normalized url -> insert params, first occurrence on the page wins
+            now = datetime.utcnow()
+            for pdf_data, norm in zip(pdf_datas, normalized):
+                if norm in rows:
+                    continue
+                rows[norm] = {
+                    'url': pdf_data['url'],
+                    'normalized_url': norm,
+                    'source_url': pdf_data['source_url'],
+                    'discovery_session_id': self.session_id,
+                    'discovered_at': now,
+                    'status': 'discovered',
+                    'extraction_method': pdf_data.get('method', 'unknown'),
+                    'extraction_confidence': pdf_data.get('confidence', 1.0),
+                    'metadata_json': {
+                        'depth': pdf_data.get('depth', 0),
+                        'source': pdf_data.get('source_url'),
+                    },
+                }
+
+            # Same statement as _store_pdf_link(), executed for all rows at once: rows
+            # inserted meanwhile by another task or process are skipped, not an error
+            stmt = (
+                sqlite_insert(PDFLink)
+                .on_conflict_do_nothing(index_elements=['normalized_url'])
+                .returning(PDFLink)
+            )
+            inserted = {link.normalized_url: link for link in db_session.scalars(stmt, list(rows.values()))}
+            ids = {norm: link.id for norm, link in inserted.items()}  # read before commit expires them
+            db_session.commit()
+
+            conflicts = [norm for norm in rows if norm not in inserted]
+            if conflicts:
+                ids.update(db_session.execute(
+                    select(PDFLink.normalized_url, PDFLink.id).where(PDFLink.normalized_url.in_(conflicts))
+                ).all())
+
+            stored = []
+            for pdf_data, norm in zip(pdf_datas, normalized):
+                pdf_data['db_id'] = ids.get(norm)
+                # Only the first occurrence of a newly inserted URL is reported as stored
+                pdf_link = inserted.pop(norm, None)
+                if pdf_link is None:
+                    logger.debug(f"Duplicate PDF URL: {norm}")
+                stored.append(pdf_link)
+
+            if len(rows) > len(conflicts):
+                logger.info(f"Stored {len(rows) - len(conflicts)} PDF links from {pdf_datas[0]['source_url']}")
+            return stored
+
+        except Exception as e:
+            logger.error(f"Failed to store PDF links: {e}")
+            db_session.rollback()
+            for pdf_data in pdf_datas:
+                pdf_data['db_id'] = None
+            return [None] * len(pdf_datas)
+
     def _normalize_url(self, url: str) -> str:
         """
         Normalize URL for deduplication.
@@ -459,10 +707,19 @@ class DeepCrawler:
         Returns:
             Normalized URL (lowercase, strip query params that don't matter)
         """
-        parsed = urlparse(url.lower())
         # For PDFs, typically only the path matters (query params often are tracking)
-        # But keep them if they seem to point to different files
-        return f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+        return normalize_url(url)
+
+    def _new_visited_set(self):
+        """Exact set, or a Bloom filter for very large crawls (discovery.visited_filter)."""
+        if self.config.discovery_visited_filter == 'bloom':
+            return BloomFilter(initial_capacity=1_000_000, error_rate=1e-4)
+        return set()
+
+    def _mark_visited(self, normalized: str):
+        if normalized not in self.visited_urls:
+            self.visited_urls.add(normalized)
+            self._visited_since_save.append(normalized)
 
     async def _save_state(self):
         """Save crawler state to disk for resuming."""
@@ -471,15 +728,24 @@ class DeepCrawler:
 
         state = {
             'session_id': self.session_id,
-            'visited_urls': list(self.visited_urls),
-            'queue': list(self.queue),
+            # Pages still being visited are saved as queued so a resume retries them
+            'queue': [*self._in_flight.values(), *self.queue],
             'stats': self.stats,
             'saved_at': datetime.utcnow().isoformat(),
         }
 
         try:
-            with open(self.state_file, 'wb') as f:
-                pickle.dump(state, f)
+            # Only URLs visited since the last save are written
+            if self._visited_since_save:
+                with open(self.visited_file, 'a', encoding='utf-8') as f:
+                    f.write('\n'.join(self._visited_since_save))
+                    f.write('\n')
+                self._visited_since_save.clear()
+
+            tmp_path = self.state_file.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                f.write(orjson.dumps(state))
+            os.replace(tmp_path, self.state_file)
             logger.debug(f"State saved: {len(self.visited_urls)} visited, {len(self.queue)} queued")
         except Exception as e:
             logger.error(f"Failed to save state: {e}")
@@ -488,10 +754,13 @@ class DeepCrawler:
         """Load crawler state from disk."""
         try:
             with open(self.state_file, 'rb') as f:
-                state = pickle.load(f)
+                state = orjson.loads(f.read())
 
-            self.visited_urls = set(state['visited_urls'])
-            self.queue = deque(state['queue'])
+            self.visited_urls = self._new_visited_set()
+            if self.visited_file.exists():
+                with open(self.visited_file, encoding='utf-8') as f:
+                    self.visited_urls.update(line.rstrip('\n') for line in f if line != '\n')
+            self.queue = deque(tuple(item) for item in state['queue'])
             self.stats.update(state['stats'])
 
             logger.info(f"State loaded from {state['saved_at']}")
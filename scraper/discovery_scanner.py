@@ -1,16 +1,19 @@
 """Discovery Scanner: Main orchestrator for PDF discovery."""
 
 import asyncio
+import importlib
 import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Set, AsyncIterable, AsyncIterator
 from pathlib import Path
 
+from sqlalchemy import bindparam, update
+
 from cendoj.scraper.browser import BrowserManager
 from cendoj.scraper.deep_crawler import DeepCrawler
 from cendoj.scraper.navigator import Navigator
 from cendoj.scraper.strategies.base import DiscoveryStrategy, StrategyResult
-from cendoj.scraper.strategies.sitemap import SitemapStrategy
 from cendoj.utils.logger import get_logger
 from cendoj.utils.proxy_manager import ProxyManager
 from cendoj.utils.ua_pool import UserAgentPool
@@ -23,6 +26,43 @@ from cendoj.config.settings import Config
 
 logger = get_logger(__name__)
 
+# Max strategies initializing or probing the sites at the same time
+STRATEGY_CONCURRENCY = 4
+
+# Discovery strategies as (module, class, Config section property); a module
+# is only imported when its section is enabled
+STRATEGIES = (
+    ('cendoj.scraper.strategies.sitemap', 'SitemapStrategy', 'sitemap_config'),
+    ('cendoj.scraper.strategies.pattern_generator', 'PatternGenerator', 'pattern_generator_config'),
+    ('cendoj.scraper.strategies.search_explorer', 'SearchExplorer', 'search_explorer_config'),
+    ('cendoj.scraper.strategies.taxonomy', 'TaxonomyStrategy', 'taxonomy_config'),
+    ('cendoj.scraper.strategies.form_discovery', 'FormDiscoveryStrategy', 'form_discovery_config'),
+    ('cendoj.scraper.strategies.archive_probe', 'ArchiveProbeStrategy', 'archive_discovery_config'),
+)
+
+# Seconds to wait for strategy cleanup hooks before moving on
+STRATEGY_CLEANUP_TIMEOUT = 5.0
+
+# Connection pool shared by the HTTP strategies and DeepCrawler's HEAD checks
+HTTP_POOL_LIMIT = 100
+HTTP_POOL_LIMIT_PER_HOST = 10
+HTTP_KEEPALIVE_TIMEOUT = 75  # seconds
+HTTP_DNS_CACHE_TTL = 300  # seconds
+
+# Parameterized UPDATE for this run's session row; the SET clause comes from the
+# keys passed at execution, and the built statement is reused across checkpoints
+SESSION_UPDATE_STMT = (
+    update(DiscoverySession)
+    .where(DiscoverySession.id == bindparam('session_id'))
+    .execution_options(synchronize_session=False)
+)
+
+# Seconds between session stats checkpoints during a deep crawl
+CHECKPOINT_INTERVAL = 5.0
+
+# Pending stats checkpoints; newer ones are dropped while the writer is busy
+STATS_QUEUE_SIZE = 4
+
 
 class DiscoveryScanner:
     """
@@ -34,6 +74,14 @@ class DiscoveryScanner:
     - full: Deep crawl without depth limits
     """
 
+    __slots__ = (
+        'config', 'session_id', 'logger',
+        'browser_manager', 'proxy_manager', 'ua_pool', 'rate_limiter',
+        'behavior_sim', 'captcha_handler', 'navigator', 'deep_crawler',
+        'http_session', 'strategies', 'db_session',
+        '_stats_queue', '_stats_task', 'stats',
+    )
+
     def __init__(self, config: Config):
         """
         Initialize DiscoveryScanner.
@@ -42,7 +90,7 @@ class DiscoveryScanner:
             config: Configuration object
         """
         self.config = config
-        self.session_id = str(uuid.uuid4())
+        self.session_id = uuid.uuid4().hex
         self.logger = get_logger(__name__)
 
         # Components (initialized later)
@@ -54,6 +102,7 @@ class DiscoveryScanner:
         self.captcha_handler: Optional[CAPTCHAHandler] = None
         self.navigator: Optional[Navigator] = None
         self.deep_crawler: Optional[DeepCrawler] = None
+        self.http_session = None  # aiohttp.ClientSession shared by strategies and crawler
 
         # Strategy plugins
         self.strategies: List[DiscoveryStrategy] = []
@@ -61,6 +110,10 @@ class DiscoveryScanner:
         # DB session
         self.db_session = None
 
+        # Background writer for periodic stats checkpoints (see _stats_writer)
+        self._stats_queue: Optional[asyncio.Queue] = None
+        self._stats_task: Optional[asyncio.Task] = None
+
         # Stats
         self.stats = {
             'total_pdfs': 0,
@@ -75,6 +128,10 @@ class DiscoveryScanner:
         """
         Initialize all components.
 
+        Runs on the caller's event loop: blocking work (DB access, DNS,
+        file I/O) done here or in components must go through an executor
+        or an async client so it does not stall concurrent tasks.
+
         Args:
             resume_session_id: Session ID to resume from
         """
@@ -96,10 +153,25 @@ class DiscoveryScanner:
         self.db_session.commit()
         self.logger.info(f"Created discovery session: {self.session_id}")
 
+        self._stats_queue = asyncio.Queue(maxsize=STATS_QUEUE_SIZE)
+        self._stats_task = asyncio.ensure_future(self._stats_writer())
+
         # Initialize components
+        import aiohttp
+        self.http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=HTTP_POOL_LIMIT,
+                limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+                keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+            )
+        )
+
         self.browser_manager = BrowserManager(
             headless=self.config.headless,
-            stealth=self.config.stealth_mode
+            stealth=self.config.stealth_mode,
+            pool_size=self.config.discovery_concurrency,
+            rotate_after=self.config.fingerprint_rotate_after if self.config.stealth_mode and self.config.fingerprint_randomized else 0
         )
         await self.browser_manager.start()
 
@@ -155,56 +227,42 @@ class DiscoveryScanner:
             ua_pool=self.ua_pool,
             rate_limiter=self.rate_limiter,
             captcha_handler=self.captcha_handler,
-            behavior_sim=self.behavior_sim
+            behavior_sim=self.behavior_sim,
+            http_session=self.http_session
         )
 
-        self._load_strategies()
+        # Strategies only feed deep crawl seeds
+        if self.config.discovery_mode != 'shallow':
+            self._load_strategies()
         if self.strategies:
-            await asyncio.gather(*(strategy.initialize() for strategy in self.strategies))
+            semaphore = asyncio.Semaphore(STRATEGY_CONCURRENCY)
+            ready = await asyncio.gather(
+                *(self._init_strategy(strategy, semaphore) for strategy in self.strategies)
+            )
+            self.strategies = [strategy for strategy, ok in zip(self.strategies, ready) if ok]
 
         self.logger.info("All components initialized successfully")
 
-    async def run(self, collections: Optional[list] = None, resume: bool = False):
+    def run(self, collections: Optional[list] = None, resume: bool = False) -> AsyncIterator[Dict[str, Any]]:
         """
         Main discovery loop.
 
+        The mode is checked once here and the matching generator is
+        returned as is, so each item comes straight from it.
+
         Args:
             collections: Optional list of collections to scrape (from sites.yaml)
             resume: Whether to resume from previous session
         """
-        try:
-            # Get seed URLs
-            if self.config.discovery_mode == 'shallow':
-                # Use original Navigator approach
-                self.logger.info("Running in SHALLOW mode (table extraction only)")
-                async for sentence in self._run_shallow(collections):
-                    yield sentence
-            else:
-                # Deep crawl mode
-                self.logger.info(f"Running in {self.config.discovery_mode.upper()} mode (deep crawl)")
-                strategy_results = await self._run_strategies()
-                seed_urls = await self._get_seed_urls(collections, strategy_results)
-
-                await self.deep_crawler.initialize(
-                    session_id=self.session_id,
-                    seed_urls=seed_urls
-                )
-
-                async for pdf in self.deep_crawler.crawl():
-                    self.stats['total_pdfs'] += 1
-                    if pdf.get('validation', {}).get('accessible'):
-                        self.stats['accessible'] += 1
-                    else:
-                        self.stats['broken'] += 1
-
-                    # Update session stats periodically
-                    if self.stats['total_pdfs'] % 100 == 0:
-                        await self._update_session_stats()
-
-                    yield pdf
-
-                self.stats['pages_visited'] = self.deep_crawler.stats['pages_visited']
+        if self.config.discovery_mode == 'shallow':
+            return self._run_shallow(collections)
+        return self._run_deep(collections)
 
+    @asynccontextmanager
+    async def _run_guard(self):
+        """Record interrupts/failures on the session row and always clean up."""
+        try:
+            yield
         except KeyboardInterrupt:
             self.logger.warning("Interrupted by user")
             await self._update_session_status('interrupted')
@@ -216,6 +274,37 @@ class DiscoveryScanner:
         finally:
             await self.cleanup()
 
+    async def _run_deep(self, collections: Optional[list]):
+        """
+        Deep crawl from strategy and config seeds.
+
+        Args:
+            collections: Optional collection filters
+        """
+        async with self._run_guard():
+            self.logger.info(f"Running in {self.config.discovery_mode.upper()} mode (deep crawl)")
+            await self.deep_crawler.initialize(
+                session_id=self.session_id,
+                seed_urls=self._iter_seed_urls(collections, self._run_strategies())
+            )
+
+            stats = self.stats
+            # Checkpoints run on a timer, so long stretches without PDFs still get them
+            checkpoints = asyncio.ensure_future(self._checkpoint_loop())
+            try:
+                async for pdf in self.deep_crawler.crawl():
+                    stats['total_pdfs'] += 1
+                    validation = pdf.get('validation')
+                    if validation and validation.get('accessible'):
+                        stats['accessible'] += 1
+                    else:
+                        stats['broken'] += 1
+                    yield pdf
+            finally:
+                checkpoints.cancel()
+
+            self.stats['pages_visited'] = self.deep_crawler.stats['pages_visited']
+
     async def _run_shallow(self, collections: Optional[list]):
         """
         Shallow discovery using Navigator (original table extraction).
@@ -223,82 +312,76 @@ class DiscoveryScanner:
         Args:
             collections: Optional collection filters
         """
-        # Use original Navigator's discover_sentences
-        async with self.navigator as nav:
-            async for sentence in nav.discover_sentences():
-                # Convert Sentence to dict
-                yield {
-                    'url': sentence.pdf_url,
-                    'source_url': sentence.metadata.get('source_url', ''),
-                    'depth': 0,
-                    'method': 'table_css',
-                    'validation': {},
-                    'sentence': sentence,
-                }
+        async with self._run_guard():
+            self.logger.info("Running in SHALLOW mode (table extraction only)")
+            # Use original Navigator's discover_sentences
+            async with self.navigator as nav:
+                async for sentence in nav.discover_sentences():
+                    # Convert Sentence to dict
+                    yield {
+                        'url': sentence.pdf_url,
+                        'source_url': sentence.metadata.get('source_url', ''),
+                        'depth': 0,
+                        'method': 'table_css',
+                        'validation': {},
+                        'sentence': sentence,
+                    }
 
-    async def _get_seed_urls(self, collections: Optional[list], strategy_results: Optional[List[StrategyResult]] = None) -> list:
+    async def _iter_seed_urls(self, collections: Optional[list], strategy_results: Optional[AsyncIterable[StrategyResult]] = None) -> AsyncIterator[str]:
         """
-        Get seed URLs for deep crawl, combining strategy outputs and config paths.
+        Yield unique seed URLs for deep crawl, combining config paths and strategy outputs.
+
+        Config seeds come first since they are available immediately;
+        strategy seeds follow as each strategy finishes.
 
         Args:
             collections: Optional specific collections
-            strategy_results: Optional list of strategy discovery payloads
+            strategy_results: Optional async stream of strategy discovery payloads
 
-        Returns:
-            List of deduplicated seed URLs
+        Yields:
+            Seed URLs, each one only once
         """
-        urls = []
-
-        if strategy_results:
-            for result in strategy_results:
-                urls.extend(result.seed_urls)
+        seen: Set[str] = set()
 
         if collections:
             sites = self.config.sites
-            for site in sites:
-                async with self.navigator as nav:
+            async with self.navigator as nav:
+                for site in sites:
                     # Placeholder for collection-specific logic
                     pass
         else:
-            for site in self.config.sites:
-                if not site.get('enabled', True):
-                    continue
-                base_url = (site.get('base_url') or '').rstrip('/')
-                if not base_url:
-                    continue
-                for path in site.get('paths', []):
-                    if not path:
-                        continue
-                    url = f"{base_url}/{path.lstrip('/')}"
-                    urls.append(url)
-
-        deduped = list(dict.fromkeys(urls))
-        self.logger.info(f"Generated {len(deduped)} seed URLs ({len(urls)} before dedup)")
-        return deduped
+            for url in self.config.site_seed_urls:
+                if url not in seen:
+                    seen.add(url)
+                    yield url
+
+        if strategy_results is not None:
+            async for result in strategy_results:
+                for url in result.seed_urls:
+                    if url not in seen:
+                        seen.add(url)
+                        yield url
+
+        self.logger.info(f"Generated {len(seen)} seed URLs")
 
     def _load_strategies(self):
         """Instantiate enabled discovery strategies."""
-        from cendoj.scraper.strategies.pattern_generator import PatternGenerator
-        from cendoj.scraper.strategies.search_explorer import SearchExplorer
-        from cendoj.scraper.strategies.taxonomy import TaxonomyStrategy
-        from cendoj.scraper.strategies.form_discovery import FormDiscoveryStrategy
-        from cendoj.scraper.strategies.archive_probe import ArchiveProbeStrategy
-        available = [
-            SitemapStrategy,
-            PatternGenerator,
-            SearchExplorer,
-            TaxonomyStrategy,
-            FormDiscoveryStrategy,
-            ArchiveProbeStrategy,
-        ]
         self.strategies = []
-        for strategy_cls in available:
+        for module_path, class_name, config_attr in STRATEGIES:
+            if not getattr(self.config, config_attr, {}).get('enabled', False):
+                self.logger.debug(f"Strategy disabled: {class_name}")
+                continue
+            strategy_cls = getattr(importlib.import_module(module_path), class_name)
+            if not strategy_cls.is_enabled(self.config):
+                self.logger.debug(f"Strategy disabled: {strategy_cls.name}")
+                continue
             strategy = strategy_cls(
                 config=self.config,
                 browser_manager=self.browser_manager,
                 rate_limiter=self.rate_limiter,
                 proxy_manager=self.proxy_manager,
                 ua_pool=self.ua_pool,
+                http_session=self.http_session,
             )
             if strategy.enabled:
                 self.logger.info(f"Strategy enabled: {strategy.name}")
@@ -306,68 +389,157 @@ class DiscoveryScanner:
             else:
                 self.logger.debug(f"Strategy disabled: {strategy.name}")
 
-    async def _run_strategies(self) -> List[StrategyResult]:
-        """Execute all configured strategies sequentially."""
-        results: List[StrategyResult] = []
-        for strategy in self.strategies:
+    async def _init_strategy(self, strategy: DiscoveryStrategy, semaphore: asyncio.Semaphore) -> bool:
+        """Initialize a single strategy; a failure only disables that strategy."""
+        async with semaphore:
+            try:
+                await strategy.initialize()
+                return True
+            except Exception as exc:
+                self.logger.error(f"Strategy {strategy.name} failed to initialize: {exc}", exc_info=True)
+                return False
+
+    async def _run_strategies(self) -> AsyncIterator[StrategyResult]:
+        """Execute all configured strategies concurrently, yielding results as they finish."""
+        semaphore = asyncio.Semaphore(STRATEGY_CONCURRENCY)
+        tasks = [
+            asyncio.ensure_future(self._safe_discover(strategy, semaphore))
+            for strategy in self.strategies
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                if result:
+                    yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _safe_discover(self, strategy: DiscoveryStrategy, semaphore: asyncio.Semaphore) -> Optional[StrategyResult]:
+        """Run a single strategy, isolating its failures from the others."""
+        async with semaphore:
             try:
                 self.logger.info(f"Running strategy: {strategy.name}")
                 result = await strategy.discover()
                 if result:
-                    results.append(result)
                     self.logger.info(
                         f"Strategy {strategy.name} produced {len(result.seed_urls)} seed URLs"
                     )
+                return result
             except Exception as exc:
                 self.logger.error(f"Strategy {strategy.name} failed: {exc}", exc_info=True)
-        return results
+                return None
+
+    async def _checkpoint_loop(self):
+        """Queue a session stats checkpoint every CHECKPOINT_INTERVAL seconds."""
+        while True:
+            await asyncio.sleep(CHECKPOINT_INTERVAL)
+            self._queue_session_stats()
+
+    def _queue_session_stats(self):
+        """Hand a stats checkpoint to the background writer without waiting for the DB."""
+        snap = self.deep_crawler.stats_snapshot()
+        values = {
+            'total_pages_visited': snap['pages_visited'],
+            'total_links_found': snap['pdfs_found'],
+            'new_links': self.stats['total_pdfs'],
+            'errors': snap['errors'],
+        }
+        try:
+            self._stats_queue.put_nowait(values)
+        except asyncio.QueueFull:
+            self.logger.debug("Stats writer busy, skipping checkpoint")
+
+    async def _stats_writer(self):
+        """Write queued stats checkpoints in a worker thread until a None sentinel arrives."""
+        loop = asyncio.get_running_loop()
+        # Own session: the worker thread must not share self.db_session
+        db_session = get_session()
+        try:
+            while True:
+                values = await self._stats_queue.get()
+                if values is None:
+                    break
+                await loop.run_in_executor(None, self._update_session_stats, db_session, values)
+        finally:
+            db_session.close()
 
-    async def _update_session_stats(self):
+    def _update_session_stats(self, db_session, values: Dict[str, int]):
         """Update discovery session record in DB."""
         try:
-            session = self.db_session.query(DiscoverySession).filter_by(id=self.session_id).first()
-            if session:
-                session.total_pages_visited = self.deep_crawler.stats['pages_visited']
-                session.total_links_found = self.deep_crawler.stats['pdfs_found']
-                session.new_links = self.stats['total_pdfs']
-                session.errors = self.deep_crawler.stats['errors']
-                self.db_session.commit()
+            self._write_session(db_session, **values)
         except Exception as e:
             self.logger.error(f"Failed to update session stats: {e}")
 
     async def _update_session_status(self, status: str):
         """Update discovery session status."""
         try:
-            session = self.db_session.query(DiscoverySession).filter_by(id=self.session_id).first()
-            if session:
-                session.status = status
-                session.end_time = datetime.utcnow()
-                if status == 'interrupted':
-                    # Save current state
-                    session.interrupted_at = {
-                        'queue_size': len(self.deep_crawler.queue),
-                        'visited_count': len(self.deep_crawler.visited_urls),
-                        'current_depth': 0,  # TODO: capture actual depth
-                    }
-                self.db_session.commit()
+            values = {'status': status, 'end_time': datetime.utcnow()}
+            if status == 'interrupted':
+                # Save current state
+                values['interrupted_at'] = {
+                    'queue_size': len(self.deep_crawler.queue),
+                    'visited_count': len(self.deep_crawler.visited_urls),
+                    'current_depth': self.deep_crawler.current_depth,
+                }
+            self._write_session(self.db_session, **values)
         except Exception as e:
             self.logger.error(f"Failed to update session status: {e}")
 
+    def _write_session(self, db_session, **values):
+        """UPDATE this run's DiscoverySession row in place, without loading it first."""
+        try:
+            db_session.execute(SESSION_UPDATE_STMT, {'session_id': self.session_id, **values})
+            db_session.commit()
+        except Exception:
+            db_session.rollback()
+            raise
+
     async def cleanup(self):
         """Clean up resources."""
         self.logger.info("Cleaning up DiscoveryScanner...")
 
+        # These don't depend on each other, so tear them down side by side
+        teardown = []
+        if self._stats_task:
+            teardown.append(self._stop_stats_writer())
         if self.strategies:
-            await asyncio.gather(*(strategy.cleanup() for strategy in self.strategies))
-
+            teardown.append(self._cleanup_strategies())
         if self.browser_manager:
-            await self.browser_manager.stop()
+            teardown.append(self.browser_manager.stop())
+        if teardown:
+            await asyncio.gather(*teardown)
+
+        if self.http_session:
+            await self.http_session.close()
+            self.http_session = None
 
         if self.db_session:
             self.db_session.close()
 
         self.logger.info("Cleanup complete")
 
+    async def _stop_stats_writer(self):
+        """Let the stats writer flush what is already queued, then stop it."""
+        task, self._stats_task = self._stats_task, None
+        if not task.done():
+            await self._stats_queue.put(None)
+        await asyncio.gather(task, return_exceptions=True)
+
+    async def _cleanup_strategies(self):
+        """Run strategy cleanup hooks, giving up on any that hang."""
+        try:
+            results = await asyncio.wait_for(
+                asyncio.gather(*(strategy.cleanup() for strategy in self.strategies), return_exceptions=True),
+                timeout=STRATEGY_CLEANUP_TIMEOUT,
+            )
+        except asyncio.TimeoutError:
+            self.logger.warning(f"Strategy cleanup timed out after {STRATEGY_CLEANUP_TIMEOUT}s")
+            return
+        for strategy, result in zip(self.strategies, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Strategy {strategy.name} cleanup failed: {result}")
+
     async def __aenter__(self):
         await self.initialize()
         return self
@@ -1,10 +1,13 @@
 import asyncio
 import hashlib
+import logging
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Awaitable, Callable, Optional
 
+import aiohttp
 from tenacity import retry, retry_if_exception_type, wait_random_exponential
 
 from cendoj.config.settings import Settings
@@ -15,6 +18,59 @@ from cendoj.utils.rate_limiter import RateLimiter
 
 logger = get_logger(__name__)
 
+# Read size for checksum hashing; large blocks keep the per-call overhead low
+CHECKSUM_BLOCK_SIZE = 1 << 20  # 1 MiB
+
+# Range GET used to probe a URL: the headers of a full download, one byte of body
+PROBE_HEADERS = {"Range": "bytes=0-0"}
+
+# Download errors not worth retrying
+FINAL_HTTP_STATUSES = (404, 410)
+
+# Downloaded bytes collected before each file write is handed to a worker thread
+WRITE_BATCH_SIZE = 1 << 20  # 1 MiB
+# Cap on buffers per batch; stays below the kernel's IOV_MAX (1024 on Linux)
+WRITE_BATCH_MAX_BUFFERS = 512
+
+# Completions between "progress" summary lines in download_all/validate_all
+PROGRESS_REPORT_EVERY = 100
+
+# Seconds a download may go without receiving data before it is abandoned
+DOWNLOAD_SOCK_READ_TIMEOUT = 30
+
+# Digests remembered per (path, mtime, size), so re-verifying an unchanged file is free
+DIGEST_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=DIGEST_CACHE_SIZE)
+def _file_sha256(path: str, mtime_ns: int, size: int) -> str:
+    """SHA256 hex digest of a file, read in large blocks into one reused buffer.
+
+    mtime_ns and size are only part of the cache key: a rewritten file gets a
+    new key and is hashed again.
+    """
+    sha256 = hashlib.sha256()
+    buf = bytearray(CHECKSUM_BLOCK_SIZE)
+    view = memoryview(buf)
+    with open(path, "rb", buffering=0) as f:
+        while n := f.readinto(buf):
+            sha256.update(view[:n])
+    return sha256.hexdigest()
+
+
+def _write_buffers(f, buffers) -> None:
+    """Write a batch of buffers to an unbuffered file, in one writev() where available."""
+    if not hasattr(os, "writev"):
+        f.writelines(buffers)
+        return
+    fd = f.fileno()
+    written = os.writev(fd, buffers)
+    if written < sum(map(len, buffers)):
+        # Short writes are rare on regular files; finish the remainder one write at a time
+        rest = memoryview(b"".join(buffers))[written:]
+        while rest:
+            rest = rest[os.write(fd, rest):]
+
 
 @dataclass
 class DownloadResult:
@@ -49,6 +105,16 @@ def retry_on_failure(max_attempts: int = 3, wait_min: float = 1, wait_max: float
     )
 
 
+def _probe_size(headers) -> Optional[int]:
+    """Full resource size from a range probe response, if the server reports it."""
+    content_range = headers.get("Content-Range")  # e.g. "bytes 0-0/123456"
+    if content_range:
+        total = content_range.rpartition("/")[2]
+        return int(total) if total.isdigit() else None
+    content_length = headers.get("Content-Length")  # range ignored: full-body length
+    return int(content_length) if content_length else None
+
+
 class Downloader:
     def __init__(
         self,
@@ -66,167 +132,220 @@ class Downloader:
         self.request_retries = config.request_retries
         self.chunk_size = config.chunk_size
         self.download_timeout = config.download_timeout
+        self._download_timeout = aiohttp.ClientTimeout(
+            total=self.download_timeout, sock_read=DOWNLOAD_SOCK_READ_TIMEOUT
+        )
+        self._probe_timeout = aiohttp.ClientTimeout(total=config.validate_url_timeout)
 
-        # Track active downloads for concurrency control
-        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        # Track active downloads (concurrency is bounded by the worker pool, see _run_pool)
         self._active_downloads = set()
 
+        # aiohttp.ClientSession shared by all downloads/validations, see _get_session()
+        self._session = None
+        self._default_headers = {"User-Agent": getattr(config, "user_agent", "Mozilla/5.0")}
+
+    def _get_session(self):
+        """Shared keep-alive HTTP session (created on first use)."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_concurrent,
+                    limit_per_host=self.max_concurrent,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=30,
+                ),
+                timeout=self._download_timeout,
+                headers=self._default_headers,
+            )
+        return self._session
+
+    async def start(self):
+        """Open the shared HTTP session up front."""
+        self._get_session()
+
+    async def close(self):
+        """Close the shared HTTP session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
     def _get_file_path(self, sentence: Sentence) -> Path:
         """Generate deterministic file path for a sentence."""
         filename = f"{sentence.cendoj_number}.pdf"
         return self.pdf_dir / filename
 
-    def _verify_checksum(self, file_path: Path, expected: Optional[str]) -> bool:
-        """Verify SHA256 checksum of downloaded file."""
+    def _existing_files(self) -> dict[str, int]:
+        """Sizes of the files already in pdf_dir by name (one directory scan instead of a lookup per sentence)."""
+        with os.scandir(self.pdf_dir) as entries:
+            return {entry.name: entry.stat().st_size for entry in entries if entry.is_file()}
+
+    async def _verify_checksum(self, file_path: Path, expected: Optional[str], expected_size: Optional[int] = None) -> bool:
+        """Verify size and SHA256 checksum of downloaded file (hashed in a worker thread)."""
+        stat = file_path.stat()
+        # A size mismatch (e.g. a truncated partial download) fails with or without a checksum
+        if expected_size is not None and stat.st_size != expected_size:
+            return False
         if not expected:
             return True
-        sha256 = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            while chunk := f.read(self.chunk_size):
-                sha256.update(chunk)
-        computed = sha256.hexdigest()
+        loop = asyncio.get_running_loop()
+        computed = await loop.run_in_executor(None, _file_sha256, str(file_path), stat.st_mtime_ns, stat.st_size)
         return computed == expected
 
     async def _download_file(self, sentence: Sentence, resume: bool = True) -> DownloadResult:
         """Core download implementation with retry logic."""
-        async with self._semaphore:
-            self._active_downloads.add(sentence.id)
-            start_time = asyncio.get_event_loop().time()
-
-            try:
-                file_path = self._get_file_path(sentence)
-                url = sentence.pdf_url
-
-                # Check if already downloaded and valid
-                if file_path.exists() and resume:
-                    if self._verify_checksum(file_path, sentence.checksum):
-                        logger.info(f"File already exists and valid: {file_path}")
-                        return DownloadResult(
-                            sentence_id=sentence.id,
-                            success=True,
-                            file_path=str(file_path),
-                            duration=0.0
-                        )
-                    else:
-                        logger.warning(f"Existing file invalid, will re-download: {file_path}")
-                        file_path.unlink(missing_ok=True)
-
-                # Apply rate limiting before starting
-                await self.rate_limiter.wait()
-
-                # Attempt download with retry
-                attempt = 0
-                while attempt < self.request_retries:
-                    attempt += 1
-                    try:
-                        logger.info(f"Downloading {sentence.id} from {url} (attempt {attempt})")
-
-                        # Use aiohttp for async HTTP download
-                        import aiohttp
-                        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.download_timeout)) as session:
-                            headers = {"User-Agent": getattr(self.config, "user_agent", "Mozilla/5.0")}
-                            async with session.get(url, headers=headers) as response:
-                                response.raise_for_status()
-
-                                # Get total size if available
-                                total_size = int(response.headers.get("Content-Length", 0))
-                                mode = "ab" if resume and file_path.exists() else "wb"
-                                downloaded = file_path.stat().st_size if mode == "ab" else 0
-
-                                # Stream to file
-                                with open(file_path, mode) as f:
-                                    async for chunk in response.content.iter_chunked(self.chunk_size):
-                                        f.write(chunk)
-                                        downloaded += len(chunk)
-                                        if total_size:
-                                            progress = downloaded / total_size * 100
-                                            logger.debug(f"Progress: {progress:.1f}%")
-
-                        logger.info(f"Downloaded {sentence.id} to {file_path}")
-
-                        # Verify checksum if provided
-                        if not self._verify_checksum(file_path, sentence.checksum):
-                            raise IOError("Checksum verification failed")
-
-                        # Update sentence object
-                        sentence.file_path = str(file_path)
-                        sentence.downloaded_at = asyncio.get_event_loop().time()
-
-                        return DownloadResult(
-                            sentence_id=sentence.id,
-                            success=True,
-                            file_path=str(file_path),
-                            duration=asyncio.get_event_loop().time() - start_time
-                        )
-
-                    except Exception as e:
-                        if attempt >= self.request_retries:
-                            raise
-                        logger.warning(f"Download failed (attempt {attempt}): {e}")
-                        await asyncio.sleep(2 ** attempt)  # Exponential backoff
-
-                raise RuntimeError("Max retries exceeded")
-
-            except Exception as e:
-                logger.error(f"Download failed for {sentence.id}: {e}")
-                return DownloadResult(
-                    sentence_id=sentence.id,
-                    success=False,
-                    error=str(e),
-                    duration=asyncio.get_event_loop().time() - start_time
-                )
-            finally:
-                self._active_downloads.discard(sentence.id)
+        self._active_downloads.add(sentence.id)
+        start_time = asyncio.get_event_loop().time()
+
+        try:
+            file_path = self._get_file_path(sentence)
+            url = sentence.pdf_url
+
+            # Check if already downloaded and valid
+            if file_path.exists() and resume:
+                if await self._verify_checksum(file_path, sentence.checksum, sentence.expected_size):
+                    logger.info(f"File already exists and valid: {file_path}")
+                    return DownloadResult(
+                        sentence_id=sentence.id,
+                        success=True,
+                        file_path=str(file_path),
+                        duration=0.0
+                    )
+                else:
+                    logger.warning(f"Existing file invalid, will re-download: {file_path}")
+                    file_path.unlink(missing_ok=True)
+
+            # Apply rate limiting before starting
+            await self.rate_limiter.wait()
+
+            # Attempt download with retry
+            attempt = 0
+            while attempt < self.request_retries:
+                attempt += 1
+                try:
+                    logger.info(f"Downloading {sentence.id} from {url} (attempt {attempt})")
+
+                    async with self._get_session().get(url) as response:
+                        response.raise_for_status()
+
+                        # Get total size if available
+                        total_size = response.content_length or 0
+                        mode = "ab" if resume and file_path.exists() else "wb"
+                        downloaded = file_path.stat().st_size if mode == "ab" else 0
+                        # Content-Length is the encoded size when the body is compressed
+                        if total_size and mode == "wb" and "Content-Encoding" not in response.headers:
+                            sentence.expected_size = total_size
+
+                        # Stream to file, keeping the buffers as they arrive; iter_chunked()
+                        # would re-slice/join them into chunk_size pieces (extra copies).
+                        # Writes go to a worker thread in batches so a slow disk doesn't
+                        # stall the other downloads on the event loop; each batch is a
+                        # single writev() on the raw file. Progress is logged per batch,
+                        # keeping the per-chunk loop down to bookkeeping.
+                        loop = asyncio.get_running_loop()
+                        log_progress = bool(total_size) and logger.isEnabledFor(logging.DEBUG)
+                        pending, pending_size = [], 0
+                        with open(file_path, mode, buffering=0) as f:
+                            async for chunk in response.content.iter_any():
+                                pending.append(chunk)
+                                pending_size += len(chunk)
+                                downloaded += len(chunk)
+                                if (pending_size >= WRITE_BATCH_SIZE
+                                        or len(pending) >= WRITE_BATCH_MAX_BUFFERS):
+                                    await loop.run_in_executor(None, _write_buffers, f, pending)
+                                    pending, pending_size = [], 0
+                                    if log_progress:
+                                        logger.debug("Progress: %.1f%%", downloaded / total_size * 100)
+                            if pending:
+                                await loop.run_in_executor(None, _write_buffers, f, pending)
+
+                    logger.info(f"Downloaded {sentence.id} to {file_path}")
+
+                    # Verify checksum if provided
+                    if not await self._verify_checksum(file_path, sentence.checksum, sentence.expected_size):
+                        raise IOError("Checksum verification failed")
+
+                    # Update sentence object
+                    sentence.file_path = str(file_path)
+                    sentence.downloaded_at = asyncio.get_event_loop().time()
+
+                    return DownloadResult(
+                        sentence_id=sentence.id,
+                        success=True,
+                        file_path=str(file_path),
+                        duration=asyncio.get_event_loop().time() - start_time
+                    )
+
+                except Exception as e:
+                    # A missing document won't appear on retry
+                    if attempt >= self.request_retries or getattr(e, "status", None) in FINAL_HTTP_STATUSES:
+                        raise
+                    logger.warning(f"Download failed (attempt {attempt}): {e}")
+                    await asyncio.sleep(2 ** attempt)  # Exponential backoff
+
+            raise RuntimeError("Max retries exceeded")
+
+        except Exception as e:
+            logger.error(f"Download failed for {sentence.id}: {e}")
+            return DownloadResult(
+                sentence_id=sentence.id,
+                success=False,
+                error=str(e),
+                duration=asyncio.get_event_loop().time() - start_time
+            )
+        finally:
+            self._active_downloads.discard(sentence.id)
 
     async def download(self, sentence: Sentence, resume: bool = True) -> DownloadResult:
         """Download a single sentence PDF with rate limiting and retry."""
-        async with self.rate_limiter:
-            return await self._download_file(sentence, resume)
+        return await self._download_file(sentence, resume)
 
-    async def validate_url(self, sentence: Sentence) -> ValidationResult:
-        """Validate if a sentence PDF URL is accessible without downloading."""
+    async def probe_url(self, sentence: Sentence) -> ValidationResult:
+        """
+        Check if a sentence PDF URL is accessible without downloading it.
+
+        Sends a one-byte range GET rather than HEAD: it returns the same
+        headers (plus the full size in Content-Range) and is served like a
+        normal download by CDNs that handle HEAD poorly.
+        """
         start_time = asyncio.get_event_loop().time()
         
         try:
             # Apply rate limiting before starting
             await self.rate_limiter.wait()
             
-            import aiohttp
-            async with aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=self.config.validate_url_timeout)
-            ) as session:
-                headers = {"User-Agent": getattr(self.config, "user_agent", "Mozilla/5.0")}
-                async with session.head(sentence.pdf_url, headers=headers) as response:
-                    status_code = response.status
+            session = self._get_session()
+            async with session.get(sentence.pdf_url, headers=PROBE_HEADERS, timeout=self._probe_timeout) as response:
+                status_code = response.status
+                
+                # Check if URL is accessible (206 = range honoured, 200 = range ignored)
+                if status_code in (200, 206):
+                    # Get additional information from headers
+                    content_type = response.headers.get("Content-Type", "")
+                    size = _probe_size(response.headers)
+                    if "Content-Encoding" not in response.headers:
+                        sentence.expected_size = size
+                    
+                    logger.info(f"URL accessible: {sentence.pdf_url} (Status: {status_code}, Size: {size or 'unknown'})")
+                    
+                    return ValidationResult(
+                        sentence_id=sentence.id,
+                        accessible=True,
+                        status_code=status_code,
+                        content_type=content_type,
+                        size=size,
+                        duration=asyncio.get_event_loop().time() - start_time
+                    )
+                else:
+                    logger.warning(f"URL not accessible: {sentence.pdf_url} (Status: {status_code})")
+                    
+                    return ValidationResult(
+                        sentence_id=sentence.id,
+                        accessible=False,
+                        status_code=status_code,
+                        error=f"HTTP {status_code}",
+                        duration=asyncio.get_event_loop().time() - start_time
+                    )
                     
-                    # Check if URL is accessible
-                    if status_code == 200:
-                        # Get additional information from headers
-                        content_type = response.headers.get("Content-Type", "")
-                        content_length = response.headers.get("Content-Length")
-                        size = int(content_length) if content_length else None
-                        
-                        logger.info(f"URL accessible: {sentence.pdf_url} (Status: {status_code}, Size: {size or 'unknown'})")
-                        
-                        return ValidationResult(
-                            sentence_id=sentence.id,
-                            accessible=True,
-                            status_code=status_code,
-                            content_type=content_type,
-                            size=size,
-                            duration=asyncio.get_event_loop().time() - start_time
-                        )
-                    else:
-                        logger.warning(f"URL not accessible: {sentence.pdf_url} (Status: {status_code})")
-                        
-                        return ValidationResult(
-                            sentence_id=sentence.id,
-                            accessible=False,
-                            status_code=status_code,
-                            error=f"HTTP {status_code}",
-                            duration=asyncio.get_event_loop().time() - start_time
-                        )
-                        
         except Exception as e:
             logger.error(f"Error validating URL {sentence.pdf_url}: {e}")
             
@@ -237,88 +356,124 @@ class Downloader:
                 duration=asyncio.get_event_loop().time() - start_time
             )
 
+    @staticmethod
+    def _unique_sentences(sentences: list[Sentence]) -> list[Sentence]:
+        """Drop sentences sharing a cendoj_number (same PDF) with an earlier one."""
+        unique = {}
+        for sentence in sentences:
+            unique.setdefault(sentence.cendoj_number, sentence)
+        if len(unique) < len(sentences):
+            logger.info(f"Dropped {len(sentences) - len(unique)} duplicate sentences")
+        return list(unique.values())
+
+    async def _run_pool(self, items: list, func: Callable[[Any], Awaitable[Any]], on_result: Optional[Callable[[Any], None]] = None) -> list:
+        """
+        Run func over items with max_concurrent workers.
+
+        Each worker picks the next item as soon as it finishes the previous
+        one, so one slow request never holds back the others.
+
+        Returns:
+            Results in the same order as items
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        for entry in enumerate(items):
+            queue.put_nowait(entry)
+        results = [None] * len(items)
+
+        async def worker():
+            while True:
+                try:
+                    index, item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                result = await func(item)
+                results[index] = result
+                if on_result:
+                    on_result(result)
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(min(self.max_concurrent, len(items)))]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+        return results
+
     async def validate_urls_batch(self, sentences: list[Sentence]) -> list[ValidationResult]:
         """Validate multiple URLs concurrently with rate limiting."""
-        tasks = [self.validate_url(sentence) for sentence in sentences]
-        results = await asyncio.gather(*tasks, return_exceptions=False)
-        return results
+        return await self._run_pool(sentences, self.probe_url)
 
     async def validate_all(self, sentences: list[Sentence]) -> tuple[int, int, list[ValidationResult]]:
         """Validate all URLs without downloading."""
+        sentences = self._unique_sentences(sentences)
         logger.info(f"Starting validation of {len(sentences)} URLs")
-        
+
         # Track statistics
         total = len(sentences)
         validated = 0
         accessible = 0
         inaccessible = 0
-        results = []
-        
-        # Process sentences in batches
-        for i in range(0, len(sentences), self.max_concurrent):
-            batch = sentences[i:i + self.max_concurrent]
-            logger.info(f"Validating batch {i//self.max_concurrent + 1}: {len(batch)} URLs")
-            
-            try:
-                validation_results = await self.validate_urls_batch(batch)
-                results.extend(validation_results)
-                
-                for result in validation_results:
-                    validated += 1
-                    if result.accessible:
-                        accessible += 1
-                        logger.info(f"✓ URL accessible: {result.sentence_id} ({validated}/{total}, {result.size or 'unknown'} bytes)")
-                    else:
-                        inaccessible += 1
-                        logger.warning(f"✗ URL inaccessible: {result.sentence_id} - {result.error} ({validated}/{total})")
-                        
-            except Exception as e:
-                logger.error(f"Validation batch failed: {e}")
-                inaccessible += len(batch)
-                validated += len(batch)
-                continue
-                
+
+        def report(result: ValidationResult):
+            nonlocal validated, accessible, inaccessible
+            validated += 1
+            if result.accessible:
+                accessible += 1
+                logger.debug("✓ URL accessible: %s (%d/%d, %s bytes)", result.sentence_id, validated, total, result.size or 'unknown')
+            else:
+                inaccessible += 1
+                logger.warning(f"✗ URL inaccessible: {result.sentence_id} - {result.error} ({validated}/{total})")
+            if validated % PROGRESS_REPORT_EVERY == 0:
+                logger.info("Validation progress: %d/%d (%d accessible, %d inaccessible)", validated, total, accessible, inaccessible)
+
+        results = await self._run_pool(sentences, self.probe_url, on_result=report)
+
         logger.info(f"Validation completed: {accessible} accessible, {inaccessible} inaccessible, {total} total")
         return accessible, inaccessible, results
 
     async def download_batch(self, sentences: list[Sentence]) -> list[DownloadResult]:
         """Download multiple sentences concurrently with rate limiting."""
-        tasks = [self.download(sentence) for sentence in sentences]
-        results = await asyncio.gather(*tasks, return_exceptions=False)
-        return results
+        return await self._run_pool(sentences, self.download)
 
     async def download_all(self, sentences: list[Sentence]):
         """Download all sentences with error handling and logging."""
+        sentences = self._unique_sentences(sentences)
         logger.info(f"Starting download of {len(sentences)} sentences")
-        
+
+        # Files already on disk with no checksum to verify and no size mismatch count
+        # as done (as in _verify_checksum), so they never reach the worker pool
+        existing = self._existing_files()
+
+        def already_done(sentence: Sentence) -> bool:
+            size = existing.get(self._get_file_path(sentence).name)
+            return (size is not None and not sentence.checksum
+                    and sentence.expected_size in (None, size))
+
+        todo = [s for s in sentences if not already_done(s)]
+        skipped = len(sentences) - len(todo)
+        if skipped:
+            logger.info(f"Skipping {skipped} sentences already downloaded")
+
         # Track statistics
         total = len(sentences)
-        completed = 0
-        successful = 0
+        completed = skipped
+        successful = skipped
         failed = 0
-        
-        # Process sentences in batches
-        for i in range(0, len(sentences), self.max_concurrent):
-            batch = sentences[i:i + self.max_concurrent]
-            logger.info(f"Processing batch {i//self.max_concurrent + 1}: {len(batch)} sentences")
-            
-            try:
-                results = await self.download_batch(batch)
-                
-                for result in results:
-                    completed += 1
-                    if result.success:
-                        successful += 1
-                        logger.info(f"✓ Downloaded {result.sentence_id} ({completed}/{total})")
-                    else:
-                        failed += 1
-                        logger.error(f"✗ Failed {result.sentence_id}: {result.error} ({completed}/{total})")
-                        
-            except Exception as e:
-                logger.error(f"Batch failed: {e}")
-                failed += len(batch)
-                completed += len(batch)
-                continue
-                
+
+        def report(result: DownloadResult):
+            nonlocal completed, successful, failed
+            completed += 1
+            if result.success:
+                successful += 1
+                logger.debug("✓ Downloaded %s (%d/%d)", result.sentence_id, completed, total)
+            else:
+                failed += 1
+                logger.error(f"✗ Failed {result.sentence_id}: {result.error} ({completed}/{total})")
+            if completed % PROGRESS_REPORT_EVERY == 0:
+                logger.info("Download progress: %d/%d (%d successful, %d failed)", completed, total, successful, failed)
+
+        await self._run_pool(todo, self.download, on_result=report)
+
         logger.info(f"Download completed: {successful} successful, {failed} failed, {total} total")
         return successful, failed
@@ -2,11 +2,50 @@
 
 import json
 import random
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from cendoj.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Init script overriding navigator/screen/timezone; filled in by FingerprintSpoofer.render()
+FINGERPRINT_JS_TEMPLATE = """
+        // Override navigator properties
+        Object.defineProperty(navigator, 'userAgent', {{
+            get: () => '{user_agent}'
+        }});
+
+        Object.defineProperty(navigator, 'platform', {{
+            get: () => '{platform}'
+        }});
+
+        Object.defineProperty(navigator, 'hardwareConcurrency', {{
+            get: () => {hardware_concurrency}
+        }});
+
+        Object.defineProperty(navigator, 'deviceMemory', {{
+            get: () => {device_memory}
+        }});
+
+        // Spoof screen resolution
+        Object.defineProperty(screen, 'width', {{ get: () => {screen_width} }});
+        Object.defineProperty(screen, 'height', {{ get: () => {screen_height} }});
+        Object.defineProperty(screen, 'availWidth', {{ get: () => {avail_width} }});
+        Object.defineProperty(screen, 'availHeight', {{ get: () => {avail_height} }});
+
+        // Override timezone
+        Object.defineProperty(Intl.DateTimeFormat.prototype, 'resolvedOptions', {{
+            get: function() {{
+                const original = this._originalResolvedOptions || originalResolvedOptions;
+                return function() {{
+                    const options = original.apply(this, arguments);
+                    options.timeZone = '{timezone}';
+                    options.locale = '{language}';
+                    return options;
+                }};
+            }}
+        }});
+"""
+
 class FingerprintSpoofer:
     """Spoofs browser fingerprints to evade detection."""
 
@@ -43,49 +82,28 @@ class FingerprintSpoofer:
         """Return a random fingerprint from the pool."""
         return random.choice(self.fingerprints).copy()
 
-    async def apply_to_context(self, context):
-        """Apply fingerprint spoofing to browser context."""
-        fingerprint = self.get_random_fingerprint()
+    def render(self, fingerprint: Optional[Dict[str, Any]] = None) -> str:
+        """Render the spoofing init script for a fingerprint (random if not given)."""
+        fingerprint = fingerprint or self.get_random_fingerprint()
         logger.debug(f"Applying fingerprint: {fingerprint['user_agent']}")
+        screen_width, screen_height = fingerprint["screen_resolution"].split('x')
+        avail_width, avail_height = fingerprint["available_screen_resolution"].split('x')
+        return FINGERPRINT_JS_TEMPLATE.format(
+            user_agent=fingerprint["user_agent"],
+            platform=fingerprint["platform"],
+            hardware_concurrency=fingerprint["hardware_concurrency"],
+            device_memory=fingerprint["device_memory"],
+            screen_width=screen_width,
+            screen_height=screen_height,
+            avail_width=avail_width,
+            avail_height=avail_height,
+            timezone=fingerprint["timezone"],
+            language=fingerprint["language"],
+        )
 
-        # Inject JavaScript to override navigator properties
-        script = f"""
-        // Override navigator properties
-        Object.defineProperty(navigator, 'userAgent', {{
-            get: () => '{fingerprint["user_agent"]}'
-        }});
-
-        Object.defineProperty(navigator, 'platform', {{
-            get: () => '{fingerprint["platform"]}'
-        }});
-
-        Object.defineProperty(navigator, 'hardwareConcurrency', {{
-            get: () => {fingerprint["hardware_concurrency"]}
-        }});
-
-        Object.defineProperty(navigator, 'deviceMemory', {{
-            get: () => {fingerprint["device_memory"]}
-        }});
-
-        // Spoof screen resolution
-        Object.defineProperty(screen, 'width', {{ get: () => {fingerprint["screen_resolution"].split('x')[0]} }});
-        Object.defineProperty(screen, 'height', {{ get: () => {fingerprint["screen_resolution"].split('x')[1]} }});
-        Object.defineProperty(screen, 'availWidth', {{ get: () => {fingerprint["available_screen_resolution"].split('x')[0]} }});
-        Object.defineProperty(screen, 'availHeight', {{ get: () => {fingerprint["available_screen_resolution"].split('x')[1]} }});
-
-        // Override timezone
-        Object.defineProperty(Intl.DateTimeFormat.prototype, 'resolvedOptions', {{
-            get: function() {{
-                const original = this._originalResolvedOptions || originalResolvedOptions;
-                return function() {{
-                    const options = original.apply(this, arguments);
-                    options.timeZone = '{fingerprint["timezone"]}';
-                    options.locale = '{fingerprint["language"]}';
-                    return options;
-                }};
-            }}
-        }});
-        """
+    async def apply_to_context(self, context):
+        """Apply fingerprint spoofing to browser context."""
+        script = self.render()
 
         await context.add_init_script(script)
         logger.info("Fingerprint spoofing applied")
@@ -97,6 +97,8 @@ class CendojScraper:
 
     async def cleanup(self):
         """Clean up resources."""
+        if self.downloader:
+            await self.downloader.close()
         if self.browser:
             await self.browser.stop()
         if self.db:
@@ -16,6 +16,7 @@ class Sentence:
     checksum: Optional[str] = None
     downloaded_at: Optional[datetime] = None
     metadata: dict = None
+    expected_size: Optional[int] = None  # bytes, from Content-Length when known
 
 @dataclass
 class Collection:
@@ -17,10 +17,11 @@ class ArchiveProbeStrategy(DiscoveryStrategy):
     """Detect and probe archive/legacy sections of the site."""
 
     name = "archive_probe"
+    config_attr = "archive_discovery_config"
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self._archive_config = getattr(self.config, 'archive_discovery_config', lambda: {})()
+        self._archive_config = self.section(self.config)
         self._session: aiohttp.ClientSession = None
         self._path_templates = self._archive_config.get('path_templates', [
             '/archivos/{year}',
@@ -31,18 +32,13 @@ class ArchiveProbeStrategy(DiscoveryStrategy):
         ])
         self._start_year = int(self._archive_config.get('start_year', 2000))
         self._max_probes = int(self._archive_config.get('max_probes', 500))
-        self._include_patterns = [__import__('re').compile(p) for p in self._archive_config.get('include_patterns', [])]
-        self._exclude_patterns = [__import__('re').compile(p) for p in self._archive_config.get('exclude_patterns', [])]
-
-    @property
-    def enabled(self) -> bool:
-        return bool(self._archive_config.get('enabled', False))
 
     async def initialize(self):
         if not self.enabled or self._session:
             return
-        timeout = aiohttp.ClientTimeout(total=self._archive_config.get('timeout_seconds', 30))
-        self._session = aiohttp.ClientSession(timeout=timeout)
+        self._compile_filters(self._archive_config)
+        self._timeout = aiohttp.ClientTimeout(total=self._archive_config.get('timeout_seconds', 30))
+        self._session = self.http_session or aiohttp.ClientSession(timeout=self._timeout)
 
     async def discover(self) -> StrategyResult:
         result = StrategyResult(metadata={'strategy': self.name})
@@ -77,7 +73,7 @@ class ArchiveProbeStrategy(DiscoveryStrategy):
                     if self.rate_limiter:
                         await self.rate_limiter.wait()
                     
-                    async with self._session.head(url, allow_redirects=True) as resp:
+                    async with self._session.head(url, allow_redirects=True, timeout=self._timeout) as resp:
                         if resp.status == 200:
                             result.seed_urls.append(url)
                             self.logger.debug(f"Archive found: {url}")
@@ -94,7 +90,8 @@ class ArchiveProbeStrategy(DiscoveryStrategy):
 
     async def cleanup(self):
         if self._session:
-            await self._session.close()
+            if self._session is not self.http_session:
+                await self._session.close()
             self._session = None
 
     def _filter_urls(self, urls: List[str]) -> List[str]:
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import re
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
@@ -22,6 +23,7 @@ class DiscoveryStrategy(ABC):
     """Abstract base class for discovery strategies."""
 
     name: str = "base"
+    config_attr: str = ""  # Config property holding this strategy's section
 
     def __init__(
         self,
@@ -30,18 +32,39 @@ class DiscoveryStrategy(ABC):
         rate_limiter=None,
         proxy_manager=None,
         ua_pool=None,
+        http_session=None,
     ):
         self.config = config
         self.browser_manager = browser_manager
         self.rate_limiter = rate_limiter
         self.proxy_manager = proxy_manager
         self.ua_pool = ua_pool
+        # Shared aiohttp.ClientSession owned by the caller; strategies that
+        # get one must not close it
+        self.http_session = http_session
         self.logger = get_logger(f"{self.__class__.__name__}")
 
+    @classmethod
+    def section(cls, config) -> Dict[str, Any]:
+        """This strategy's configuration section ({} when the config has none)."""
+        if not cls.config_attr:
+            return {}
+        return getattr(config, cls.config_attr, None) or {}
+
+    @classmethod
+    def is_enabled(cls, config) -> bool:
+        """Whether the strategy would run, checked before constructing it."""
+        return bool(cls.section(config).get('enabled', False))
+
     @property
     def enabled(self) -> bool:
         """Whether the strategy should run."""
-        return True
+        return self.is_enabled(self.config)
+
+    def _compile_filters(self, section: Dict[str, Any]):
+        """Compile the section's include/exclude URL patterns."""
+        self._include_patterns = [re.compile(p) for p in section.get('include_patterns', [])]
+        self._exclude_patterns = [re.compile(p) for p in section.get('exclude_patterns', [])]
 
     async def initialize(self):
         """Optional async initialization before running."""
@@ -20,26 +20,27 @@ class FormDiscoveryStrategy(DiscoveryStrategy):
     """Discover and submit forms to uncover hidden PDF listings."""
 
     name = "form_discovery"
+    config_attr = "form_discovery_config"
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self._form_config = getattr(self.config, 'form_discovery_config', lambda: {})()
+        self._form_config = self.section(self.config)
         self._session: aiohttp.ClientSession = None
         self._max_combinations = int(self._form_config.get('max_combinations', 1000))
         self._seed_pages = self._form_config.get('seed_pages', [])
         self._form_selectors = self._form_config.get('form_selectors', ['form'])
-        self._include_patterns = [re.compile(p) for p in self._form_config.get('include_patterns', [])]
-        self._exclude_patterns = [re.compile(p) for p in self._form_config.get('exclude_patterns', [])]
 
-    @property
-    def enabled(self) -> bool:
-        return bool(self._form_config.get('enabled', False)) and bool(self._seed_pages)
+    @classmethod
+    def is_enabled(cls, config) -> bool:
+        section = cls.section(config)
+        return bool(section.get('enabled', False)) and bool(section.get('seed_pages', []))
 
     async def initialize(self):
         if not self.enabled or self._session:
             return
-        timeout = aiohttp.ClientTimeout(total=self._form_config.get('timeout_seconds', 60))
-        self._session = aiohttp.ClientSession(timeout=timeout)
+        self._compile_filters(self._form_config)
+        self._timeout = aiohttp.ClientTimeout(total=self._form_config.get('timeout_seconds', 60))
+        self._session = self.http_session or aiohttp.ClientSession(timeout=self._timeout)
 
     async def discover(self) -> StrategyResult:
         result = StrategyResult(metadata={'strategy': self.name})
@@ -63,7 +64,8 @@ class FormDiscoveryStrategy(DiscoveryStrategy):
 
     async def cleanup(self):
         if self._session:
-            await self._session.close()
+            if self._session is not self.http_session:
+                await self._session.close()
             self._session = None
 
     async def _fetch_and_parse_forms(self, page_url: str) -> List[Dict]:
@@ -72,7 +74,7 @@ class FormDiscoveryStrategy(DiscoveryStrategy):
             await self.rate_limiter.wait()
         if not self._session:
             await self.initialize()
-        async with self._session.get(page_url) as resp:
+        async with self._session.get(page_url, timeout=self._timeout) as resp:
             resp.raise_for_status()
             html = await resp.text()
         soup = BeautifulSoup(html, 'html.parser')
@@ -125,12 +127,12 @@ class FormDiscoveryStrategy(DiscoveryStrategy):
                 if self.rate_limiter:
                     await self.rate_limiter.wait()
                 if form['method'] == 'post':
-                    async with self._session.post(form['action'], data=params) as resp:
+                    async with self._session.post(form['action'], data=params, timeout=self._timeout) as resp:
                         html = await resp.text()
                 else:
                     query = urlencode(params)
                     full_url = f"{form['action']}?{query}"
-                    async with self._session.get(full_url) as resp:
+                    async with self._session.get(full_url, timeout=self._timeout) as resp:
                         html = await resp.text()
                 # Extract PDFs from response HTML
                 found = re.findall(r'https?://[^\s"\'<>]+\.pdf', html, re.IGNORECASE)
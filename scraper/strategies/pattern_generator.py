@@ -16,22 +16,16 @@ class PatternGenerator(DiscoveryStrategy):
     """Generate missing URLs by filling gaps in sequential numeric patterns."""
 
     name = "pattern_generator"
+    config_attr = "pattern_generator_config"
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        # Get config (use same pattern as sitemap: config.pattern_generator_config)
-        self._pattern_config = getattr(self.config, 'pattern_generator_config', lambda: {})()
+        self._pattern_config = self.section(self.config)
         self._min_samples = int(self._pattern_config.get('min_samples', 100))
-        self._include_patterns = [re.compile(p) for p in self._pattern_config.get('include_patterns', [])]
-        self._exclude_patterns = [re.compile(p) for p in self._pattern_config.get('exclude_patterns', [])]
         self._max_urls = int(self._pattern_config.get('max_urls', 10000))
 
-    @property
-    def enabled(self) -> bool:
-        return bool(self._pattern_config.get('enabled', False))
-
     async def initialize(self):
-        pass
+        self._compile_filters(self._pattern_config)
 
     async def discover(self) -> StrategyResult:
         result = StrategyResult(metadata={'strategy': self.name})
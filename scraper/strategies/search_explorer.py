@@ -16,25 +16,21 @@ class SearchExplorer(DiscoveryStrategy):
     """Exhaustively query the search API to collect PDF links beyond UI pagination."""
 
     name = "search_explorer"
+    config_attr = "search_explorer_config"
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self._search_config = getattr(self.config, 'search_explorer_config', lambda: {})()
+        self._search_config = self.section(self.config)
         self._session: Optional[aiohttp.ClientSession] = None
         self._max_results = int(self._search_config.get('max_results', 50000))
         self._max_per_request = int(self._search_config.get('max_per_request', 1000))
-        self._include_patterns = [re.compile(p) for p in self._search_config.get('include_patterns', [])]
-        self._exclude_patterns = [re.compile(p) for p in self._search_config.get('exclude_patterns', [])]
-
-    @property
-    def enabled(self) -> bool:
-        return bool(self._search_config.get('enabled', False))
 
     async def initialize(self):
         if not self.enabled or self._session:
             return
-        timeout = aiohttp.ClientTimeout(total=self._search_config.get('timeout_seconds', 60))
-        self._session = aiohttp.ClientSession(timeout=timeout)
+        self._compile_filters(self._search_config)
+        self._timeout = aiohttp.ClientTimeout(total=self._search_config.get('timeout_seconds', 60))
+        self._session = self.http_session or aiohttp.ClientSession(timeout=self._timeout)
 
     async def discover(self) -> StrategyResult:
         result = StrategyResult(metadata={'strategy': self.name})
@@ -62,7 +58,8 @@ class SearchExplorer(DiscoveryStrategy):
 
     async def cleanup(self):
         if self._session:
-            await self._session.close()
+            if self._session is not self.http_session:
+                await self._session.close()
             self._session = None
 
     async def _explore_site(self, base_url: str, api_url: str, jurisdictions: List[str]) -> List[str]:
@@ -94,7 +91,7 @@ class SearchExplorer(DiscoveryStrategy):
             await self.rate_limiter.wait()
         if not self._session:
             await self.initialize()
-        async with self._session.post(url, data=payload) as resp:
+        async with self._session.post(url, data=payload, timeout=self._timeout) as resp:
             resp.raise_for_status()
             return await resp.text()
 
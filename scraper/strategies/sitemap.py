@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import re
 import xml.etree.ElementTree as ET
 from typing import List, Optional, Set
 
@@ -15,27 +14,27 @@ class SitemapStrategy(DiscoveryStrategy):
     """Fetch and parse sitemap XML files to produce seed URLs."""
 
     name = "sitemap"
+    config_attr = "sitemap_config"
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self._sitemap_config = getattr(self.config, 'sitemap_config', lambda: {})()
+        self._sitemap_config = self.section(self.config)
         self._session: Optional[aiohttp.ClientSession] = None
         self._max_depth = int(self._sitemap_config.get('max_depth', 3))
         self._max_urls = int(self._sitemap_config.get('max_urls', 5000))
         self._follow_indexes = self._sitemap_config.get('follow_sitemap_links', True)
-        self._include_patterns = [re.compile(p) for p in self._sitemap_config.get('include_patterns', [])]
-        self._exclude_patterns = [re.compile(p) for p in self._sitemap_config.get('exclude_patterns', [])]
 
-    @property
-    def enabled(self) -> bool:
-        urls = self._sitemap_config.get('urls', [])
-        return bool(self._sitemap_config.get('enabled', False) and urls)
+    @classmethod
+    def is_enabled(cls, config) -> bool:
+        section = cls.section(config)
+        return bool(section.get('enabled', False) and section.get('urls', []))
 
     async def initialize(self):
         if not self.enabled or self._session:
             return
-        timeout = aiohttp.ClientTimeout(total=self._sitemap_config.get('timeout_seconds', 30))
-        self._session = aiohttp.ClientSession(timeout=timeout)
+        self._compile_filters(self._sitemap_config)
+        self._timeout = aiohttp.ClientTimeout(total=self._sitemap_config.get('timeout_seconds', 30))
+        self._session = self.http_session or aiohttp.ClientSession(timeout=self._timeout)
 
     async def discover(self) -> StrategyResult:
         result = StrategyResult(metadata={'strategy': self.name})
@@ -63,7 +62,8 @@ class SitemapStrategy(DiscoveryStrategy):
 
     async def cleanup(self):
         if self._session:
-            await self._session.close()
+            if self._session is not self.http_session:
+                await self._session.close()
             self._session = None
 
     async def _fetch_text(self, url: str) -> Optional[str]:
@@ -75,7 +75,7 @@ class SitemapStrategy(DiscoveryStrategy):
         if self.rate_limiter:
             await self.rate_limiter.wait()
 
-        async with self._session.get(url) as resp:
+        async with self._session.get(url, timeout=self._timeout) as resp:
             if resp.status != 200:
                 self.logger.warning(f"HTTP {resp.status} fetching sitemap {url}")
                 return None
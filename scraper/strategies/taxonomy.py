@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import re
 from typing import List, Dict, Any, Set
 from urllib.parse import urljoin
 
@@ -14,27 +13,26 @@ class TaxonomyStrategy(DiscoveryStrategy):
     """Traverse navigation structures to enumerate every collection/section."""
 
     name = "taxonomy"
+    config_attr = "taxonomy_config"
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self._tax_config = getattr(self.config, 'taxonomy_config', lambda: {})()
+        self._tax_config = self.section(self.config)
         self._max_pages_per_site = int(self._tax_config.get('max_pages_per_site', 100))
         self._selectors = self._tax_config.get('selectors', [
             'nav a', '.menu a', '.sidebar a', '.navigation a', '.nav-menu a',
             '[role="navigation"] a', '.breadcrumb a'
         ])
-        self._include_patterns = [re.compile(p) for p in self._tax_config.get('include_patterns', [])]
-        self._exclude_patterns = [re.compile(p) for p in self._tax_config.get('exclude_patterns', [])]
 
     @property
     def enabled(self) -> bool:
         # Requires browser manager
         if not self.browser_manager:
             return False
-        return bool(self._tax_config.get('enabled', False))
+        return self.is_enabled(self.config)
 
     async def initialize(self):
-        pass
+        self._compile_filters(self._tax_config)
 
     async def discover(self) -> StrategyResult:
         result = StrategyResult(metadata={'strategy': self.name})
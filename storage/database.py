@@ -1,6 +1,6 @@
 """Database engine and session management."""
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.orm import sessionmaker
 
 from cendoj.storage.schemas import Base
@@ -9,6 +9,61 @@ from cendoj.storage.schemas import Base
 _engine = None
 _SessionLocal = None
 
+# Applied to every new SQLite connection: WAL lets the `stats`/`export`
+# readers run alongside the discovery writer, NORMAL sync drops the fsync per
+# commit (still safe under WAL), and a larger page cache + mmap speed up scans
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # 256 MB
+    "PRAGMA cache_size=-200000",  # ~200 MB (negative = KiB)
+)
+
+# Per-status PDF link counters kept up to date by triggers, so that overview
+# queries (cli `stats`) don't have to count a potentially huge pdf_links table
+LINK_COUNTERS_TABLE = "pdf_link_counters"
+
+_LINK_COUNTERS_DDL = [
+    f"""
+    CREATE TABLE IF NOT EXISTS {LINK_COUNTERS_TABLE} (
+        status TEXT PRIMARY KEY,
+        n INTEGER NOT NULL DEFAULT 0,
+        validated INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_pdf_links_count_insert
+    AFTER INSERT ON pdf_links
+    BEGIN
+        INSERT INTO {LINK_COUNTERS_TABLE} (status, n, validated)
+        VALUES (COALESCE(NEW.status, ''), 1, NEW.validated_at IS NOT NULL)
+        ON CONFLICT(status) DO UPDATE SET n = n + 1, validated = validated + excluded.validated;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_pdf_links_count_update
+    AFTER UPDATE OF status, validated_at ON pdf_links
+    BEGIN
+        UPDATE {LINK_COUNTERS_TABLE}
+        SET n = n - 1, validated = validated - (OLD.validated_at IS NOT NULL)
+        WHERE status = COALESCE(OLD.status, '');
+        INSERT INTO {LINK_COUNTERS_TABLE} (status, n, validated)
+        VALUES (COALESCE(NEW.status, ''), 1, NEW.validated_at IS NOT NULL)
+        ON CONFLICT(status) DO UPDATE SET n = n + 1, validated = validated + excluded.validated;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_pdf_links_count_delete
+    AFTER DELETE ON pdf_links
+    BEGIN
+        UPDATE {LINK_COUNTERS_TABLE}
+        SET n = n - 1, validated = validated - (OLD.validated_at IS NOT NULL)
+        WHERE status = COALESCE(OLD.status, '');
+    END
+    """,
+]
+
 
 def init_db(db_path: str = "data/cendoj.db"):
     """Initialize database engine and create tables."""
@@ -27,15 +82,49 @@ def init_db(db_path: str = "data/cendoj.db"):
         connect_args={"check_same_thread": False}  # Allow multithreading
     )
 
+    event.listen(_engine, "connect", _set_sqlite_pragmas)
+
     # Create session factory
     _SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=_engine)
 
     # Create tables
     Base.metadata.create_all(bind=_engine)
 
+    # create_all() skips indexes on tables that already exist, so make sure
+    # indexes added after a database was created are present too
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=_engine, checkfirst=True)
+
+    _ensure_link_counters(_engine)
+
     return _engine
 
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune each new SQLite connection (see SQLITE_PRAGMAS)."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def _ensure_link_counters(engine):
+    """Create the trigger-maintained link counters, backfilling existing databases."""
+    backfill = not inspect(engine).has_table(LINK_COUNTERS_TABLE)
+    with engine.begin() as conn:
+        for ddl in _LINK_COUNTERS_DDL:
+            conn.execute(text(ddl))
+        if backfill:
+            conn.execute(text(
+                f"INSERT INTO {LINK_COUNTERS_TABLE} (status, n, validated) "
+                "SELECT COALESCE(status, ''), COUNT(*), SUM(validated_at IS NOT NULL) "
+                "FROM pdf_links GROUP BY COALESCE(status, '')"
+            ))
+
+
 def get_session():
     """Get a new database session."""
     if _SessionLocal is None:
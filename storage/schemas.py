@@ -3,12 +3,37 @@
 from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Float, JSON, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.types import TypeDecorator
 from datetime import datetime
 import json
+import orjson
 
 Base = declarative_base()
 
 
+def _orjson_default(obj):
+    # NamedTuples (e.g. Breadcrumb) are stored as objects, not arrays
+    if hasattr(obj, '_asdict'):
+        return obj._asdict()
+    raise TypeError
+
+
+class OrjsonJSON(TypeDecorator):
+    """JSON column stored as compact text and (de)serialized with orjson."""
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return orjson.dumps(value, default=_orjson_default).decode()
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return orjson.loads(value)
+
+
 class Collection(Base):
     """Represents a collection of sentences (e.g., a year or court)."""
     __tablename__ = "collections"
@@ -65,7 +90,7 @@ class BreadcrumbTrail(Base):
 
     id = Column(Integer, primary_key=True)
     page_url = Column(String, nullable=False)  # the page where breadcrumbs were found
-    breadcrumbs = Column(JSON, nullable=False)  # list of {"text": ..., "url": ...}
+    breadcrumbs = Column(OrjsonJSON, nullable=False)  # list of {"text": ..., "url": ...}
     created_at = Column(DateTime, default=datetime.utcnow)
 
     __table_args__ = (
@@ -104,6 +129,7 @@ class PDFLink(Base):
         Index('idx_pdf_links_discovery_session', 'discovery_session_id'),
         Index('idx_pdf_links_status', 'status'),
         Index('idx_pdf_links_discovered_at', 'discovered_at'),
+        Index('idx_pdf_links_status_discovered_at', 'status', 'discovered_at'),  # export ordering
     )
 
 
@@ -133,6 +159,7 @@ class DiscoverySession(Base):
     __table_args__ = (
         Index('idx_discovery_sessions_status', 'status'),
         Index('idx_discovery_sessions_start_time', 'start_time'),
+        Index('idx_discovery_sessions_status_start_time', 'status', 'start_time'),  # resume lookup
     )
 
 
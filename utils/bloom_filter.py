@@ -0,0 +1,75 @@
+"""Scalable Bloom filter for large URL sets."""
+
+import hashlib
+import math
+from typing import Iterable, List
+
+
+class _BloomStage:
+    """Fixed-capacity Bloom filter backed by a bytearray."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, h1: int, h2: int):
+        # Kirsch-Mitzenmacher: k positions from two base hashes
+        m = self.num_bits
+        return [(h1 + i * h2) % m for i in range(self.num_hashes)]
+
+    def contains(self, h1: int, h2: int) -> bool:
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(h1, h2))
+
+    def add(self, h1: int, h2: int):
+        bits = self.bits
+        for p in self._positions(h1, h2):
+            bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+
+class BloomFilter:
+    """
+    Set-like membership filter using ~10-20 bits per item instead of a full string.
+
+    Membership tests can return false positives (at most ~error_rate) but
+    never false negatives. When a stage fills up a new one with twice the
+    capacity and a tighter error rate is added, so the overall rate stays
+    bounded as the filter grows.
+    """
+
+    def __init__(self, initial_capacity: int = 1_000_000, error_rate: float = 1e-4):
+        self.error_rate = error_rate
+        self._stages: List[_BloomStage] = [_BloomStage(initial_capacity, error_rate / 2)]
+        self._len = 0
+
+    @staticmethod
+    def _hashes(item: str):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+
+    def __contains__(self, item: str) -> bool:
+        h1, h2 = self._hashes(item)
+        return any(stage.contains(h1, h2) for stage in self._stages)
+
+    def add(self, item: str):
+        h1, h2 = self._hashes(item)
+        if any(stage.contains(h1, h2) for stage in self._stages):
+            return
+        stage = self._stages[-1]
+        if stage.count >= stage.capacity:
+            stage = _BloomStage(stage.capacity * 2, self.error_rate / 2 ** (len(self._stages) + 1))
+            self._stages.append(stage)
+        stage.add(h1, h2)
+        self._len += 1
+
+    def update(self, items: Iterable[str]):
+        for item in items:
+            self.add(item)
+
+    def __len__(self) -> int:
+        """Number of distinct items added (approximate, see class docstring)."""
+        return self._len
@@ -24,17 +24,20 @@ class RateLimiter:
             else:
                 rate = 1.0
         self.rate = max(rate, 0.0)
-        self.last_call = 0.0
-        self._lock = asyncio.Lock()
+        self.last_call = float("-inf")  # time.monotonic() of the last reserved slot
 
     async def wait(self):
-        """Wait until enough time has passed since last call."""
-        async with self._lock:
-            now = time.time()
-            time_since_last = now - self.last_call
-            if self.rate > 0 and time_since_last < self.rate:
-                await asyncio.sleep(self.rate - time_since_last)
-            self.last_call = time.time()
+        """Wait until enough time has passed since last call.
+
+        The caller's slot is reserved before sleeping (no await in between, so
+        no lock is needed); concurrent callers each sleep until their own slot
+        instead of queueing on a lock held across the sleep.
+        """
+        now = time.monotonic()
+        slot = max(now, self.last_call + self.rate)
+        self.last_call = slot
+        if slot > now:
+            await asyncio.sleep(slot - now)
 
 def rate_limited(rate: float = 1.0):
     """Decorator for rate limiting async functions."""